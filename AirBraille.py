@@ -1,12 +1,18 @@
-from statistics import mode
-
-import cv2
-import mediapipe as mp
-import pyttsx3
-
 from WriteHandler import *
+from capture.Capture import *
+from capture.MotionGate import *
+from capture.Preprocess import *
+from capture.Roi import *
+from hand.Detector import *
+from hand.Filter import *
 from hand.Hand import *
+from metrics.Metrics import *
+from metrics.Tracing import *
+from preview.Preview import *
+from recording.Recording import *
 from settings.Settings import *
+from speech.Speech import *
+from voting.Voter import *
 
 
 # based upon https://google.github.io/mediapipe/solutions/hands.html#python-solution-api
@@ -18,42 +24,90 @@ class AirBraille(object):
     HANDS_VISIBLE: str = 'OK'
     HANDS_N_VISIBLE: str = 'NO'
 
-    # are hands visible
-    IS_POS_OK: bool = False
-
-    THUMB_LEFT: str = str(Settings.LEFT_THUMB)
-    THUMB_RIGHT: str = str(Settings.RIGHT_THUMB)
+    # the thumbs as braille pattern, for the default settings
+    THUMB_LEFT: int = 1 << Settings.LEFT_THUMB
+    THUMB_RIGHT: int = 1 << Settings.RIGHT_THUMB
+    THUMBS: int = THUMB_LEFT | THUMB_RIGHT
 
     EMPTY_STR: str = ''
 
-    num_of_changes: int = 0
+    # size of the blank image, the hand detection is warmed up with
+    WARM_UP_SIZE: tuple = (480, 640, 3)
 
-    mp_drawing = mp.solutions.drawing_utils
-    mp_hands = mp.solutions.hands  # hands
+    # the session label of the metrics, when AirBraille runs on its own
+    METRICS_SESSION: str = 'main'
 
-    def __init__(self, write_handler: AbstractWriteHandler, show_gui: bool = False):
+    def __init__(self, write_handler: AbstractWriteHandler, show_gui: bool = False, speech=None,
+                 settings=Settings):
         """
         Inits AirBraille.
         :param write_handler: The write handler that AirBraille uses.
         :param show_gui: Show graphical output.
+        :param speech: The audio feedback (e.g. SilentSpeech for replays), a SpeechWorker if None.
+        :param settings: The settings, e.g. Settings.derive(...) for one of several sessions.
         """
+        self.created = time.perf_counter()
+        self.time_to_first_frame = None  # seconds from creation to the first classified frame
+        self.settings = settings
         self.show_gui = show_gui
-        self.cap = cv2.VideoCapture(0)  # init webcam input
+        self.headless = settings.HEADLESS  # no drawing, no window and no debug evaluation
+        self.stopped = threading.Event()  # set by stop_detection
+        self.preview = None  # renders the preview on its own thread, see __evaluate
+        self.metrics = Metrics()  # counters and gauges, served if Settings.METRICS_PORT is set
+        self.pattern = None  # the braille pattern of the latest frame, None if there was no valid hand pair
+        self.written = None  # the latest written pattern and text
+        self.IS_POS_OK = False  # are hands visible
+        self.num_of_changes = 0
+        self.THUMB_LEFT = 1 << settings.LEFT_THUMB
+        self.THUMB_RIGHT = 1 << settings.RIGHT_THUMB
+        self.THUMBS = self.THUMB_LEFT | self.THUMB_RIGHT
+        self.evaluator = HandPairEvaluator(settings)  # evaluates the fingers of a hand pair
+        # stage latencies, for the report (TRACE) or the metrics
+        self.tracer = Tracer(self.settings.TRACE or self.settings.METRICS_PORT is not None, self.settings.TRACE_WINDOW,
+                             self.settings.TRACE_FILE)
+        self.capture = CameraCapture(self.settings.CAMERA, self.settings.FRAME_BUFFER_SIZE, self.tracer)  # webcam input
+        self.dropped_frames = 0  # frames captured, but never evaluated
+        self.last_frame_index = -1  # index of the latest evaluated frame
+        self.frame_timestamp = None  # capture timestamp of the frame being evaluated
+        self.detected_hands = NO_HANDS  # the hands of the latest evaluated frame
+        self.detector = self.settings.DETECTOR  # the name of the hand detection backend, see switch_detector
+        self.recorder = None  # records the landmarks, see open_recorder
+        self.preprocessor = FramePreprocessor(not self.settings.MIRROR_LANDMARKS)  # frames for inference
+        self.roi_tracker = RoiTracker(self.settings.ROI_MARGIN, self.settings.ROI_MAX_SIZE) if self.settings.ROI else None
+        self.landmark_filter = OneEuroFilter(
+            self.settings.SMOOTHING_MIN_CUTOFF, self.settings.SMOOTHING_BETA, self.settings.SMOOTHING_D_CUTOFF) \
+            if self.settings.SMOOTHING else None  # smooths the landmarks before evaluation
+        self.motion_gate = MotionGate(self.settings.MOTION_THRESHOLD, self.settings.MOTION_FORCE_EVERY) \
+            if self.settings.MOTION_GATE else None
         self.images_count = 0  # setup image count
         self.writer = write_handler  # setup write-handler
-        self.frame_results = []  # the frame result buffer
-        self.previous_res = self.EMPTY_STR
+        self.voter = SlidingWindowVoter(self.settings.VOTE_WINDOW, self.settings.VOTE_MARGIN)  # continuous input
+        self.sequential_voter = SequentialVoter(
+            self.settings.THRESHOLD + 1, self.settings.VOTE_MIN_FRAMES, self.settings.VOTE_CONFIDENCE) \
+            if self.settings.VOTE_SEQUENTIAL else None  # input confirmation, with early decisions
+        self.previous_res = EMPTY_PATTERN
         self.__clear_hand_pairs()
-        self.tts = pyttsx3.init()  # init text to speech
+        if speech is None:
+            # text to speech, on its own thread, with the audio of all characters and messages prepared
+            speech = SpeechWorker(settings, self.speech_texts())
+            speech.start()
+        self.speech = speech
+
+    def speech_texts(self) -> set:
+        """
+        All texts, that may be spoken as audio feedback.
+        :return: The texts.
+        """
+        return self.writer.texts() | {self.ERROR_MSG, self.HANDS_VISIBLE, self.HANDS_N_VISIBLE, self.START_MSG}
 
-    def _speak(self, msg: str):
+    def _speak(self, msg: str, kind: str = Utterance.MESSAGE):
         """
-        Provides the message as audio feedback using pyttsx3.
+        Provides the message as audio feedback. Does not wait until the message was spoken.
         :param msg: The message that is provided as audio feedback.
+        :param kind: The kind of the message, see Utterance.
         :return: void.
         """
-        self.tts.say(msg)
-        self.tts.runAndWait()
+        self.speech.say(msg, kind)
 
     def __clear_hand_pairs(self):
         """
@@ -63,14 +117,6 @@ class AirBraille(object):
         self.hand_pairs_res = dict()
         self.images_count = 0
 
-    def __drop_oldest_frame(self):
-        """
-        Removes the oldest frame from the 'buffer'
-        :return: void.
-        """
-        self.frame_results.pop(0)
-        self.images_count = self.images_count - 1
-
     def _set_hands_state(self, val: bool):
         """
         Set's the hand's state (visible or not). Notifies on changes.
@@ -92,42 +138,52 @@ class AirBraille(object):
         :return: void.
         """
         if self.IS_POS_OK:
-            self._speak(self.HANDS_VISIBLE)
+            self._speak(self.HANDS_VISIBLE, Utterance.STATE)
         else:
-            self._speak(self.HANDS_N_VISIBLE)
+            self._speak(self.HANDS_N_VISIBLE, Utterance.STATE)
 
-    def _inc_count(self, result: str):
+    def _inc_count(self, result: int, weight: float = 1.0):
         """
         Increases the count of occurrences of the passed Braille pattern.
         Triggers that the result is returned, if enough frames analyzed.
         :param result: The braille pattern the hand(s) show(s).
+        :param weight: The confidence of the pattern between 0 and 1, used by the sequential vote.
         :return: void.
         """
-        self.images_count += 1
-
-        if Settings.CONFIRM_INPUT:
+        if self.settings.CONFIRM_INPUT and self.sequential_voter is not None:
+            if result & self.THUMBS == EMPTY_PATTERN:
+                # the thumbs were released, the same pattern may be typed early again
+                self.sequential_voter.release()
+            self.sequential_voter.push(result, weight)
+            if self.sequential_voter.is_decided():
+                self.type()
+        elif self.settings.CONFIRM_INPUT:
+            self.images_count += 1
             if result in self.hand_pairs_res:
                 self.hand_pairs_res[result] += 1
             else:
                 self.hand_pairs_res[result] = 1
-        else:
-            self.frame_results.append(result)
 
-        if self.images_count > Settings.THRESHOLD:
-            self.type()
+            if self.images_count > self.settings.THRESHOLD:
+                self.type()
+        else:
+            self.voter.push(result)
+            if self.voter.is_full():
+                self.type()
 
         return
 
-    def _input_confirm(self, most_likely_key: str):
+    def _input_confirm(self, most_likely_key: int):
         """
         Mode: Input confirmation. In this case, AirBraille only returns the result (and starts analyzing)
         when the user confirmed the input.
         :param most_likely_key: The most often occurred braille pattern.
         :return: void.
         """
-        if self.THUMB_LEFT in most_likely_key and self.THUMB_RIGHT in most_likely_key:
+        thumbs = most_likely_key & self.THUMBS
+        if thumbs == self.THUMBS:
             self._write_and_speak(most_likely_key)
-        elif not (self.THUMB_LEFT in most_likely_key) and not (self.THUMB_RIGHT in most_likely_key):
+        elif thumbs == EMPTY_PATTERN:
             # user waits, we drop the frame
             pass
         else:
@@ -135,27 +191,23 @@ class AirBraille(object):
 
         return
 
-    def _continuous_input(self, frame_results):
+    def _continuous_input(self):
         """
-        Mode: Continuous input. All ten frames are evaluated.
+        Mode: Continuous input. The latest self.settings.VOTE_WINDOW frames are voted on.
         In case of a change to the previous printed result, the new result will
-        be returned.
-        :param frame_results: A list of all frame' results.
+        be returned, as soon as it leads by self.settings.VOTE_MARGIN votes.
         :return: void.
         """
         # TODO: handle user settings access
 
         # get the key, that occurs the most
-        most_likely_key = mode(frame_results)
+        most_likely_key = self.voter.leader
 
-        if most_likely_key != self.previous_res:
+        if most_likely_key != self.previous_res and self.voter.has_margin():
             self.previous_res = most_likely_key
             self._write_and_speak(most_likely_key)
 
-        # remove the oldest frame's result
-        self.__drop_oldest_frame()
-
-    def _hotkey(self, most_likely_key: str):
+    def _hotkey(self, most_likely_key: int):
         # TODO: user wants to access a hotkey
         """
         User accesses settings or hotkeys of AirBraille. This method handles this.
@@ -164,7 +216,7 @@ class AirBraille(object):
         """
         pass
 
-    def _write_and_speak(self, most_likely_key: str):
+    def _write_and_speak(self, most_likely_key: int):
         """
         Calls the WriteHandler to process the input. Removes left and right thumb from the pattern,
         that is passed to the WriteHandler, as this is preserved by AirBraille for hotkeys/settings.
@@ -173,15 +225,25 @@ class AirBraille(object):
         """
         # we will not pass '0' and '9' as they are preserved by AirBraille
         # WriteHandler's may only use '1'-'8' inclusive
-        text = self.writer.write(most_likely_key
-                                 .replace(self.THUMB_LEFT, self.EMPTY_STR)
-                                 .replace(self.THUMB_RIGHT, self.EMPTY_STR))
-        if Settings.DEBUG:
-            print(text)
+        start = self.tracer.now()
+        self.metrics.decisions += 1
+        self.metrics.decision_votes += self._votes()[0]
+        text = self.writer.write(most_likely_key & ~self.THUMBS)
+        self.written = (most_likely_key, text)
+        self.metrics.characters += len(text)
+        start = self.tracer.span('write', start)
+        if self.settings.DEBUG:
+            print(pattern_to_string(most_likely_key), text)
         if text != self.EMPTY_STR and text.isalnum():
-            self._speak(text)
+            self._speak(text, Utterance.CHARACTER)
+        elif text == self.EMPTY_STR and self.writer.is_pending():
+            pass  # the cell waits for the following ones, e.g. a capital sign
         else:
-            self._speak(self.ERROR_MSG)
+            self.metrics.errors += 1
+            self._speak(self.ERROR_MSG, Utterance.CHARACTER)
+        end = self.tracer.span('speak', start)
+        if self.frame_timestamp is not None:
+            self.tracer.span(Tracer.END_TO_END, self.frame_timestamp, end)
         return
 
     def type(self):
@@ -190,18 +252,24 @@ class AirBraille(object):
         Clears the hand pairs at the end.
         :return: void.
         """
-        most_likely_key = ''
-        most_likely_key_count = 0
-        for candidate in self.hand_pairs_res:
-            if self.hand_pairs_res[candidate] > most_likely_key_count:
-                most_likely_key_count = self.hand_pairs_res[candidate]
-                most_likely_key = candidate
+        if self.settings.CONFIRM_INPUT and self.sequential_voter is not None:
+            most_likely_key = self.sequential_voter.leader
+            self._input_confirm(most_likely_key)
+            if most_likely_key & self.THUMBS == self.THUMBS:
+                self.sequential_voter.commit(most_likely_key)
+            self.sequential_voter.clear()
+        elif self.settings.CONFIRM_INPUT:
+            most_likely_key = EMPTY_PATTERN
+            most_likely_key_count = 0
+            for candidate in self.hand_pairs_res:
+                if self.hand_pairs_res[candidate] > most_likely_key_count:
+                    most_likely_key_count = self.hand_pairs_res[candidate]
+                    most_likely_key = candidate
 
-        if Settings.CONFIRM_INPUT:
             self._input_confirm(most_likely_key)
             self.__clear_hand_pairs()
         else:
-            self._continuous_input(self.frame_results)
+            self._continuous_input()
 
         return
 
@@ -212,75 +280,253 @@ class AirBraille(object):
         """
         self.__evaluate()
 
+    @staticmethod
+    def create_detector(settings=Settings, name: str = None, tracer: Tracer = None, **options) -> AbstractHandDetector:
+        """
+        Builds the hand detection and warms it up with a dummy inference, so that the first frame
+        does not wait for the model's initialization.
+        :param settings: The settings of the detection.
+        :param name: The name of the backend, Settings.DETECTOR if None.
+        :param tracer: Records how long the warm-up takes, optional.
+        :param options: Options of the backend's detection, overriding the settings.
+        :return: The hand detection.
+        """
+        tracer = tracer if tracer is not None else Tracer()
+        start = tracer.now()
+        detector = create_hand_detector(settings, name, **options)
+        detector.warm_up(AirBraille.WARM_UP_SIZE)
+        tracer.span('warm_up', start)
+        return detector
+
+    def switch_detector(self, name: str):
+        """
+        Switches the hand detection backend, e.g. to trade accuracy for throughput. May be called from any thread,
+        the detection loop switches before its next frame.
+        :param name: The name of the backend, see Settings.DETECTOR.
+        :return: void.
+        """
+        if name not in DETECTORS:
+            raise ValueError(f'unknown hand detector: {name}')
+        self.detector = name
+
     def __evaluate(self):
-        with self.mp_hands.Hands(
-                min_detection_confidence=0.5,
-                min_tracking_confidence=0.5,
-                max_num_hands=2) as hands:
-            self._speak(self.START_MSG)
-            while self.cap.isOpened():
-                success, image = self.cap.read()
-                if not success:
-                    # print('empty camera frame ...')
-                    continue
-
-                # Flip the image horizontally for a later selfie-view display, and convert
-                # the BGR image to RGB.
-                image = cv2.cvtColor(cv2.flip(image, 1), cv2.COLOR_BGR2RGB)
-                # To improve performance, optionally mark the image as not writeable to
-                # pass by reference.
-                image.flags.writeable = False
-                results = hands.process(image)
-                if results.multi_handedness is not None:
-                    hand_pair = HandPair()
-                    valid, err_msg = hand_pair.is_valid(results.multi_handedness)
-                    if not valid:
-                        # print(err_msg)
-                        self._set_hands_state(False)
-
-                        if Settings.DEBUG:
-                            hand_pair_debug = HandPair()
-                            hand_pair_debug.define_hands(results)
-                            hand_pair_debug.evaluate()
-                            self.__draw_results(image, results)
-                            if cv2.waitKey(5) & 0xFF == 27:
-                                break
-                        continue
-
-                    self._set_hands_state(True)
-
-                    hand_pair.define_hands(results)
-                    self._inc_count(hand_pair.evaluate())
+        # the camera opens on the capture's thread and the speech engine starts on the speech's thread,
+        # meanwhile the hand detection is built here
+        self.capture.start()
+        self._speak(self.START_MSG)
+        if not self.headless and (self.show_gui or self.settings.DEBUG):
+            self.preview = PreviewRenderer(self.TITLE, self.settings.PREVIEW_FPS, self.stop_detection)
+            self.preview.start()
+        metrics_server = None
+        if self.settings.METRICS_PORT is not None:
+            metrics_server = MetricsServer(lambda: format_metrics({self.METRICS_SESSION: self}),
+                                           self.settings.METRICS_PORT, self.settings.METRICS_HOST)
+            metrics_server.start()
+        name = self.detector
+        detector = self.create_detector(self.settings, name, self.tracer)
+        try:
+            self.open_recorder()
+            tracer = self.tracer
+            while not self.stopped.is_set():
+                if self.detector != name:
+                    # switched from another thread
+                    name = self.detector
+                    previous, detector = detector, self.create_detector(self.settings, name, self.tracer)
+                    previous.close()
+                # always take the freshest frame, older ones are stale by now (a video's frames are all taken)
+                start = tracer.now()
+                frame = self.capture.buffer.latest()
+                if frame is None:
+                    break
+                tracer.span('wait', start)
+
+                image, detected_hands, valid = self.evaluate_frame(frame, detector)
+                t = tracer.now()
+                if self.preview is not None and (valid or self.settings.DEBUG):
+                    # the preprocessed image is overwritten by the next frame, the camera frame is not
+                    self.preview.post(self.__preview_state(frame.image, detected_hands))
+                    t = tracer.span('preview', t)
+                tracer.span('frame', start, t)
+        finally:
+            detector.close()
+
+        self.capture.stop()
+        if self.preview is not None:
+            self.preview.stop()
+        self.close()
+        if metrics_server is not None:
+            metrics_server.stop()
+
+    def open_recorder(self):
+        """
+        Starts recording the landmarks, if Settings.RECORD_FILE is set.
+        :return: void.
+        """
+        if self.settings.RECORD_FILE:
+            self.recorder = LandmarkRecorder(self.settings.RECORD_FILE)
+
+    def close(self):
+        """
+        Finishes the evaluation of frames: closes the recording, reports the stage latencies.
+        :return: void.
+        """
+        self.frame_timestamp = None
+        if self.recorder is not None:
+            self.recorder.close()
+            self.recorder = None
+        if self.settings.TRACE:
+            print(self.tracer.report())
+            self.tracer.export()
+            if self.motion_gate is not None:
+                print(f'motion gate: {self.motion_gate.skipped} skipped, {self.motion_gate.processed} processed')
+
+    def evaluate_frame(self, frame: Frame, detector: AbstractHandDetector):
+        """
+        Evaluates a camera frame: detects the hands and passes them on to the classification.
+        :param frame: The captured frame.
+        :param detector: The hand detection to be used.
+        :return: Tuple[the preprocessed image (RGB, valid until the next frame), the detected hands,
+                 False if the hands were rejected].
+        """
+        tracer = self.tracer
+        self.metrics.frame(time.perf_counter())
+        self.dropped_frames += frame.index - self.last_frame_index - 1
+        self.last_frame_index = frame.index
+        self.frame_timestamp = frame.timestamp
+        t = tracer.now()
+        tracer.span('frame_age', frame.timestamp, t)
+
+        # Flip the image horizontally for a later selfie-view display, and convert
+        # the BGR image to RGB, into a reused read-only buffer.
+        image = self.preprocessor.process(frame.image)
+        if self.motion_gate is not None and self.motion_gate.is_static(image):
+            # the pose is held, the previous result is still valid
+            detected_hands = self.detected_hands
+            t = tracer.span('motion_gate', t)
+        else:
+            if self.roi_tracker is not None:
+                # only pass the region around the hands on to inference
+                hands_image, roi = self.roi_tracker.crop(image)
+            else:
+                hands_image, roi = image, None
+            t = tracer.span('preprocess', t)
+            detected_hands = detector.detect(hands_image)
+            t = tracer.span('process', t)
+            if roi is not None:
+                RoiTracker.to_full_frame(detected_hands, roi, image.shape)
+                self.roi_tracker.update(detected_hands, image.shape)
+            if self.motion_gate is not None:
+                self.motion_gate.processed_frame(image, detected_hands)
+            # the classification expects the hands of the mirrored frame
+            detected_hands = self.preprocessor.to_selfie_view(detected_hands)
+            tracer.span('decode', t)
+        self.detected_hands = detected_hands
+
+        if self.recorder is not None:
+            self.recorder.write(frame.timestamp, detected_hands)
+
+        valid = self.process_hands(detected_hands, frame.timestamp)
+        if valid and len(detected_hands) > 0 and self.time_to_first_frame is None:
+            self.time_to_first_frame = time.perf_counter() - self.created
+            if self.settings.DEBUG and not self.headless:
+                print(f'first classified frame after {self.time_to_first_frame:.2f}s')
+        return image, detected_hands, valid
+
+    def process_hands(self, detected_hands: DetectedHands, timestamp: float = None) -> bool:
+        """
+        Classifies the hands of one frame and passes the braille pattern on to the voting.
+        :param detected_hands: The decoded hands of the frame.
+        :param timestamp: The capture time of the frame in seconds, for the smoothing, now if None.
+        :return: False, if the hands were rejected as invalid hand pair, True otherwise.
+        """
+        if self.landmark_filter is not None:
+            start = self.tracer.now()
+            detected_hands = self.landmark_filter.filter(
+                detected_hands, timestamp if timestamp is not None else time.perf_counter())
+            self.tracer.span('smooth', start)
+        if len(detected_hands) > 0:
+            start = self.tracer.now()
+            hand_pair = HandPair(self.evaluator)
+            valid, err_msg = hand_pair.is_valid(detected_hands)
+            if not valid:
+                # print(err_msg)
+                if err_msg == HandPair.TWO_SAME_HANDS:
+                    self.metrics.rejected_same_hands += 1
                 else:
-                    self._set_hands_state(False)
+                    self.metrics.rejected_not_two_hands += 1
+                self._set_hands_state(False)
+
+                if self.settings.DEBUG and not self.headless:
+                    hand_pair.define_hands(detected_hands)
+                    hand_pair.evaluate()
+                self.tracer.span('hand_pair', start)
+                return False
+
+            hand_pair.define_hands(detected_hands)
+            if self.sequential_voter is not None:
+                # the frame's vote counts as much as MediaPipe and the fingers' angles are certain
+                result, certainty = hand_pair.evaluate_with_certainty()
+                weight = certainty * sum(detected_hands.scores) / len(detected_hands)
+            else:
+                result = hand_pair.evaluate()
+                weight = 1.0
+            start = self.tracer.span('hand_pair', start)
+            self.process_pattern(result, weight)
+            self.tracer.span('vote', start)
+        else:
+            self.process_pattern(None)
 
-                self.__draw_results(image, results)
-                if cv2.waitKey(5) & 0xFF == 27:
-                    break
+        return True
 
-    def __draw_results(self, image, results):
+    def process_pattern(self, pattern, weight: float = 1.0):
         """
-        Draws the results on the image.
-        :param image: The image on where to draw on.
-        :param results: The results of the detection.
+        Passes the braille pattern of one frame on to the voting.
+        :param pattern: The braille pattern of the frame's hand pair, None if there was no valid hand pair.
+        :param weight: The confidence of the pattern between 0 and 1, see _inc_count.
         :return: void.
         """
-        if self.show_gui or Settings.DEBUG:
-            # Draw the hand annotations on the image.
-            image.flags.writeable = True
-            image = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
-            if results.multi_hand_landmarks:
-                for hand_landmarks in results.multi_hand_landmarks:
-                    self.mp_drawing.draw_landmarks(
-                        image, hand_landmarks, self.mp_hands.HAND_CONNECTIONS)
-            cv2.imshow(AirBraille.TITLE, image)
+        self.pattern = pattern
+        if pattern is None:
+            self._set_hands_state(False)
+        else:
+            self._set_hands_state(True)
+            self._inc_count(pattern, weight)
+
+    def _votes(self) -> tuple:
+        """
+        The votes of the current leader.
+        :return: Tuple[the leader's votes, the number of votes, that are needed to write].
+        """
+        if self.settings.CONFIRM_INPUT and self.sequential_voter is not None:
+            return self.sequential_voter.votes, self.sequential_voter.max_frames
+        elif self.settings.CONFIRM_INPUT:
+            return max(self.hand_pairs_res.values(), default=0), self.settings.THRESHOLD
+        return self.voter.votes, self.settings.VOTE_WINDOW
+
+    def __preview_state(self, image, detected_hands: DetectedHands) -> PreviewState:
+        """
+        Collects what the preview shows of the frame.
+        :param image: The camera frame (BGR, not mirrored).
+        :param detected_hands: The decoded hands of the detection, in full frame coordinates of the mirrored frame.
+        :return: The state of the preview.
+        """
+        votes, window = self._votes()
+        roi = self.roi_tracker.roi if self.roi_tracker is not None else None
+        if roi is not None and not self.preprocessor.flip:
+            # the region was tracked on the frame, that was not mirrored
+            roi = RegionOfInterest(image.shape[1] - roi.x - roi.width, roi.y, roi.width, roi.height)
+        return PreviewState(image, detected_hands, roi, self.pattern, self.written, votes, window, self.IS_POS_OK)
 
     def stop_detection(self):
         """
-        Stops the detection of AirBraille.
+        Stops the detection of AirBraille, may be called from any thread or a signal handler
+        (e.g. in headless mode, where there is no window to press ESC in).
         :return: void.
         """
-        if self.cap is not None:
-            self.cap.release()
+        self.speech.stop()
+        if self.capture.is_alive():
+            self.stopped.set()
+            self.capture.stop()
+            self.capture.buffer.close()  # wakes up the detection, if it waits for a frame
         else:
             print('Cannot stop, detection has not even started yet!')
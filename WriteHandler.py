@@ -1,53 +1,81 @@
-import keyboard
-import json
 from abc import ABC, abstractmethod
 
+from helpers.Pattern import *
+from output.Sink import *
+from table.BrailleTable import *
+from translation.Translator import *
+
+# the dots of 8-dot and 6-dot braille, as pattern
+DOTS_8: int = pattern_from_string('12345678')
+DOTS_6: int = pattern_from_string('123456')
+
 
 class AbstractWriteHandler(ABC):
     """Base class for WriteHandler's."""
 
     @abstractmethod
-    def write(self, fingers_txt: str) -> str:
+    def write(self, fingers: int) -> str:
         """
-        Defines what text according to the input braille pattern text should be produced.
-        :param fingers_txt: The braille cells that are, depending on the mode, hold as finger's position of
-        the user.
+        Defines what text according to the input braille pattern should be produced.
+        :param fingers: The braille pattern (see helpers.Pattern) that is, depending on the mode,
+        hold as finger's position of the user.
         :return The string sequence according to the braille pattern that should be printed.
         """
         pass
 
+    def flush(self) -> str:
+        """
+        Writes the pending patterns, as if no further pattern followed, e.g. at the end of the input.
+        :return: The text of the pending patterns.
+        """
+        return ''
+
+    def texts(self) -> set:
+        """
+        All texts, that the write handler may return, e.g. to prepare their audio feedback.
+        :return: The texts.
+        """
+        return set()
+
+    def is_pending(self) -> bool:
+        """
+        Determines whether the written patterns wait for the following ones, e.g. after a capital sign.
+        An empty text is only an unknown character, if nothing is pending.
+        :return: True, if patterns are pending, False otherwise.
+        """
+        return False
+
 
 class WriteHandler8Dot(AbstractWriteHandler):
     """8-dot Braille WriteHandler."""
 
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, sink: OutputSink = None):
         """
         Inits a 8-dot WriteHandler.
         :param file_path: The path to the file that contains the 8-dot braille input texts.
+        :param sink: Outputs the written text on its own thread, printed if None.
         """
+        self.sink = sink
         self.text = ''
-        self.keys = dict()
+        self.table = []
         self.file_path = file_path
         self.__setup()
 
     def __setup(self):
         """Private setup method"""
-        # here we init the replacement json-file
-        with open(self.file_path) as keys_file:
-            data = json.load(keys_file)
-            for entry in data:
-                self.keys[entry['fingers']] = entry['c']
+        # here we init the replacement json-file, compiled and cached
+        self.table = load_braille_table(self.file_path, DOTS_8)
 
-    def write(self, fingers_txt: str) -> str:
+    def texts(self) -> set:
+        return set(self.table) - {''}
+
+    def write(self, fingers: int) -> str:
         """
         Declares what text sequence or char should be produced according to the input.
-        :param fingers_txt: The input braille dot sequence.
+        :param fingers: The input braille pattern.
         :return: The text that is provided as audio-feedback.
         """
-        if fingers_txt in self.keys:
-            self.text = self.keys[fingers_txt]
-        else:
-            self.text = ''
+        self.text = self.table[fingers]
 
         self._send_keystroke()
         ret_val: str = self.text
@@ -55,63 +83,99 @@ class WriteHandler8Dot(AbstractWriteHandler):
         return ret_val
 
     def _send_keystroke(self):
-        # TODO: implement keyboard stroke
-        """This method sends a keystroke."""
-        print('printing ' + self.text)
-        pass
-        # keyboard.write(self.text)
+        """This method sends a keystroke, without waiting for it."""
+        if self.sink is not None:
+            self.sink.put(self.text)
+        else:
+            print('printing ' + self.text)
 
 
 class WriteHandler6Dot(AbstractWriteHandler):
     """This class is the handler for writing 6 dot German-Braille."""
 
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, sink: OutputSink = None):
         """
         Inits a 6-dot Braille WriteHandler.
         :param file_path: The path to the file that contains the 6-dot braille input texts.
+        :param sink: Outputs the written text on its own thread, optional.
         """
+        self.sink = sink
         self.previous = ''
         self.text = ''
         self.file_path = file_path
-        self.keys = dict()
+        self.table = []
         self.__setup()
 
     def __setup(self):
         """Private setup method"""
-        # here we init the replacement json-file
-        with open(self.file_path) as keys_file:
-            data = json.load(keys_file)
-            for entry in data:
-                self.keys[entry['fingers']] = entry['c']
-
-    def __map(self, fingers_txt: str) -> str:
-        """
-        Private method that maps the finger-text we got from AirBraille
-        so that it matches the one's inside the corresponding .json-file.
-        :param fingers_txt: The input braille dot sequence.
-        :return: The mapped text.
-        """
+        # here we init the replacement json-file (compiled and cached), as we do not need '7' & '8' the table ignores them
+        self.table = load_braille_table(self.file_path, DOTS_6)
 
-        # as we do not need '7' & '8' we drop them
-        fingers_txt = fingers_txt.replace('7', '').replace('8', '')
-        if fingers_txt in self.keys:
-            return self.keys[fingers_txt]
-        else:
-            return ''
+    def texts(self) -> set:
+        return set(self.table) - {''}
 
-    def write(self, fingers_text: str) -> str:
+    def write(self, fingers: int) -> str:
         """
         Overridden method from super-class. This one handles the \"actual\"
         writing. As it determines whether special case (e.g. capital-letters) or default
         cases is come to mention.
-        :param fingers_text: The input braille dot sequence.
+        :param fingers: The input braille pattern.
         :return: The text that is provided as audio-feedback.
         """
-        self.text = self.__map(fingers_text)
+        self.text = self.table[fingers]
+        self._send_keystroke()
         return self.text
 
     def _send_keystroke(self):
-        # TODO: add keyboard strokes.
-        """This method lets us send a keystroke."""
-        print('printing ' + self.text)
-        pass
+        """This method lets us send a keystroke, without waiting for it."""
+        if self.sink is not None:
+            self.sink.put(self.text)
+
+
+class WriteHandlerContracted(AbstractWriteHandler):
+    """
+    Handler for braille, where a text may span several cells, e.g. capital and number signs or contractions.
+    The cells are translated while streaming, see StreamingTranslator.
+    """
+
+    def __init__(self, file_paths: list, dots: int = DOTS_6, sink: OutputSink = None):
+        """
+        Inits a contracted braille WriteHandler.
+        :param file_paths: The paths to the files that contain the rules, e.g. the 6-dot file and its signs.
+        :param dots: The dots of the braille, e.g. DOTS_6.
+        :param sink: Outputs the written text on its own thread, optional.
+        """
+        self.sink = sink
+        self.text = ''
+        self.file_paths = file_paths
+        self.translator = StreamingTranslator(ContractionTable(file_paths, dots))
+
+    def write(self, fingers: int) -> str:
+        """
+        Translates the cell, returns the text as soon as it is unambiguous.
+        :param fingers: The input braille pattern.
+        :return: The text that is provided as audio-feedback, '' while the cell is pending.
+        """
+        self.text = self.translator.push(fingers)
+        self._send_keystroke()
+        return self.text
+
+    def flush(self) -> str:
+        """
+        Writes the pending cells, as if no further cell followed.
+        :return: The text of the pending cells.
+        """
+        self.text = self.translator.flush()
+        self._send_keystroke()
+        return self.text
+
+    def _send_keystroke(self):
+        """This method lets us send a keystroke, without waiting for it."""
+        if self.sink is not None:
+            self.sink.put(self.text)
+
+    def texts(self) -> set:
+        return self.translator.table.texts()
+
+    def is_pending(self) -> bool:
+        return self.translator.is_pending()
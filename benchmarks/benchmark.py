@@ -0,0 +1,228 @@
+# Benchmarks the classification and output hot paths on synthetic or recorded landmarks.
+# MediaPipe and the camera are replaced by local stand-ins (a scripted hand detector), run from the repository's root:
+#
+#   python -m benchmarks.benchmark                     compare against benchmarks/baseline.json, fails without it
+#   python -m benchmarks.benchmark --save-baseline     store the current numbers as baseline
+#   python -m benchmarks.benchmark --recording FILE    use the frames of a landmark recording
+
+import argparse
+import contextlib
+import itertools
+import json
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+from AirBraille import *
+from hand.Synthetic import *
+from recording.Recording import *
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+SIX_DOT_FILE = 'braille_files/6_dot_AT.json'
+EIGHT_DOT_FILE = 'braille_files/8_dot_AT.json'
+
+
+def stand_in_results(hands: DetectedHands) -> SimpleNamespace:
+    """
+    Stands in for MediaPipe's detection results, with the same fields as its protobuf messages.
+    :param hands: The hands, the results should hold.
+    :return: An object like the results of mp.solutions.hands.Hands.process.
+    """
+    if len(hands) == 0:
+        return SimpleNamespace(multi_handedness=None, multi_hand_landmarks=None)
+
+    return SimpleNamespace(
+        multi_handedness=[
+            SimpleNamespace(classification=[SimpleNamespace(index=index, score=score, label=label)])
+            for label, score, index in zip(hands.labels, hands.scores, hands.indices)
+        ],
+        multi_hand_landmarks=[
+            SimpleNamespace(landmark=[SimpleNamespace(x=float(x), y=float(y), z=float(z)) for x, y, z in landmarks])
+            for landmarks in hands.landmarks
+        ]
+    )
+
+
+def measure(func, inputs: list, setup=None, min_calls: int = 2000, min_seconds: float = 0.5) -> np.ndarray:
+    """
+    Calls func with the inputs in turn, and measures every call.
+    :param func: The function to be measured, called with one input.
+    :param inputs: The inputs, used round-robin.
+    :param setup: Optional function, called before every call (not measured).
+    :param min_calls: The minimum number of calls.
+    :param min_seconds: The minimum time to be spent in calls.
+    :return: The duration of every call in nanoseconds.
+    """
+    durations = []
+    spent = 0
+    i = 0
+    while i < min_calls or spent < min_seconds * 1e9:
+        argument = inputs[i % len(inputs)]
+        if setup is not None:
+            setup()
+        start = time.perf_counter_ns()
+        func(argument)
+        duration = time.perf_counter_ns() - start
+        durations.append(duration)
+        spent += duration
+        i += 1
+    return np.array(durations)
+
+
+def _air_braille(confirm_input: bool) -> AirBraille:
+    """
+    Creates AirBraille without camera and audio, in the given input mode.
+    :param confirm_input: The value of Settings.CONFIRM_INPUT.
+    :return: The AirBraille instance.
+    """
+    return AirBraille(WriteHandler6Dot(SIX_DOT_FILE), speech=SilentSpeech(),
+                      settings=Settings.derive(CONFIRM_INPUT=confirm_input))
+
+
+def benchmarks(hands: list) -> dict:
+    """
+    Runs all benchmarks.
+    :param hands: The detected hands of the frames, that are classified.
+    :return: The durations of every benchmark, by name.
+    """
+    results = dict()
+    pairs = [hand_pair for hand_pair in (HandPair() for _ in hands)]
+    for hand_pair, detected in zip(pairs, hands):
+        hand_pair.define_hands(detected)
+    stand_ins = [stand_in_results(detected) for detected in hands]
+    patterns = [hand_pair.evaluate() for hand_pair in pairs]
+
+    thumbs = [hand_pair.left_hand.fingers[0] for hand_pair in pairs if hand_pair.left_hand is not None]
+    fingers = [hand_pair.left_hand.fingers[1] for hand_pair in pairs if hand_pair.left_hand is not None]
+    left_hands = [hand_pair.left_hand for hand_pair in pairs if hand_pair.left_hand is not None]
+
+    results['Finger.is_stretched (thumb)'] = measure(Finger.is_stretched, thumbs)
+    results['Finger.is_stretched (other)'] = measure(Finger.is_stretched, fingers)
+    results['Hand.evaluate'] = measure(Hand.evaluate, left_hands)
+    results['HandPair.evaluate'] = measure(HandPair.evaluate, pairs)
+    results['decode_results'] = measure(decode_results, stand_ins)
+    results['HandPair.is_valid'] = measure(lambda detected: HandPair().is_valid(detected), hands)
+    results['HandPair.define_hands'] = measure(lambda detected: HandPair().define_hands(detected), hands)
+    landmark_filter = OneEuroFilter()
+    timestamps = itertools.count()
+    results['OneEuroFilter.filter'] = measure(
+        lambda detected: landmark_filter.filter(detected, next(timestamps) / 30.0), hands)
+
+    preprocessor = FramePreprocessor()
+    frame = np.random.default_rng(0).integers(0, 256, (1080, 1920, 3), dtype=np.uint8)
+    results['FramePreprocessor.process (1080p)'] = measure(preprocessor.process, [frame], min_calls=200)
+
+    for confirm_input, mode in ((True, 'confirm'), (False, 'continuous')):
+        air_braille = _air_braille(confirm_input)
+        results[f'AirBraille._inc_count ({mode})'] = measure(air_braille._inc_count, patterns)
+        results[f'AirBraille.process_hands ({mode})'] = measure(
+            lambda results_: air_braille.process_hands(decode_results(results_)), stand_ins)
+
+    air_braille = _air_braille(False)
+    detector = ScriptedHandDetector(hands, repeat=True)
+    image = np.zeros(AirBraille.WARM_UP_SIZE, dtype=np.uint8)
+    frames = itertools.count()
+    results['AirBraille.evaluate_frame (scripted)'] = measure(
+        lambda _: air_braille.evaluate_frame(Frame(image, time.perf_counter(), next(frames)), detector), [None])
+
+    air_braille = _air_braille(True)
+    votes = dict()
+    for pattern in patterns[:Settings.THRESHOLD + 1]:
+        votes[pattern] = votes.get(pattern, 0) + 1
+
+    def fill_votes():
+        air_braille.hand_pairs_res = dict(votes)
+        air_braille.images_count = Settings.THRESHOLD + 1
+    results['AirBraille.type (confirm)'] = measure(lambda _: air_braille.type(), [None], setup=fill_votes)
+
+    air_braille = _air_braille(False)
+    for pattern in patterns[:Settings.VOTE_WINDOW]:
+        air_braille.voter.push(pattern)
+    results['AirBraille.type (continuous)'] = measure(
+        lambda pattern: (air_braille.voter.push(pattern), air_braille.type()), patterns)
+
+    dots = [pattern & ~AirBraille.THUMBS for pattern in patterns]
+    results['WriteHandler6Dot.write'] = measure(WriteHandler6Dot(SIX_DOT_FILE).write, dots)
+    results['WriteHandler8Dot.write'] = measure(WriteHandler8Dot(EIGHT_DOT_FILE).write, dots)
+
+    return results
+
+
+def summarize(durations: np.ndarray) -> dict:
+    """
+    Summarizes the durations of a benchmark.
+    :param durations: The duration of every call in nanoseconds.
+    :return: calls per second and latency percentiles in microseconds.
+    """
+    p50, p95, p99 = np.percentile(durations, (50, 95, 99)) / 1000.0
+    return {
+        'calls': int(len(durations)),
+        'fps': float(1e9 / durations.mean()),
+        'p50_us': float(p50),
+        'p95_us': float(p95),
+        'p99_us': float(p99)
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Benchmarks the classification and output hot paths.')
+    parser.add_argument('--recording', metavar='FILE', help='use the frames of a landmark recording')
+    parser.add_argument('--frames', type=int, default=256, help='number of synthetic frames')
+    parser.add_argument('--baseline', default=BASELINE_FILE, help='the baseline file')
+    parser.add_argument('--save-baseline', action='store_true', help='store the results as baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='allowed relative growth of the median latency, before a benchmark fails')
+    args = parser.parse_args()
+
+    Settings.DEBUG = False
+    if args.recording:
+        hands = [detected for _, detected in LandmarkRecording(args.recording)]
+    else:
+        rng = np.random.default_rng(0)
+        hands = [synthetic_hands(int(pattern), 0.002, rng) for pattern in rng.integers(0, 1 << 10, args.frames)]
+
+    # the write handlers and the debug output print, which is not what we are interested in
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        summaries = {name: summarize(durations) for name, durations in benchmarks(hands).items()}
+
+    baseline = dict()
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+    elif not args.save_baseline:
+        # the timings depend on the machine, so there is no baseline to fall back on
+        print(f'no baseline at {args.baseline}, store one with --save-baseline', file=sys.stderr)
+
+    regressions = []
+    print(f'{"benchmark":40} {"calls/s":>12} {"p50 us":>9} {"p95 us":>9} {"p99 us":>9} {"baseline":>9}')
+    for name, summary in summaries.items():
+        base = baseline.get(name)
+        status = ''
+        if base is not None:
+            status = f'{base["p50_us"]:9.2f}'
+            if summary['p50_us'] > base['p50_us'] * (1.0 + args.tolerance):
+                regressions.append(name)
+                status += '  REGRESSION'
+        print(f'{name:40} {summary["fps"]:12.0f} {summary["p50_us"]:9.2f} {summary["p95_us"]:9.2f} '
+              f'{summary["p99_us"]:9.2f} {status}')
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as baseline_file:
+            json.dump(summaries, baseline_file, indent=2)
+        print(f'saved baseline to {args.baseline}')
+        return 0
+
+    if regressions:
+        print(f'{len(regressions)} benchmark(s) regressed by more than {args.tolerance:.0%}: {", ".join(regressions)}',
+              file=sys.stderr)
+        return 1
+    if not baseline:
+        return 2  # nothing was compared, which must not pass for a successful run
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
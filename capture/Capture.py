@@ -0,0 +1,163 @@
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from helpers.Lazy import *
+from metrics.Tracing import *
+
+cv2 = lazy_import('cv2')
+
+
+class Frame(object):
+
+    def __init__(self, image: np.ndarray, timestamp: float, index: int):
+        """
+        Inits a captured frame.
+        :param image: the camera image (BGR)
+        :param timestamp: the time.perf_counter() value, right after the image was read
+        :param index: the running number of the frame, counted by the capture
+        """
+        self.image = image
+        self.timestamp = timestamp
+        self.index = index
+
+
+class FrameBuffer(object):
+    """
+    Bounded ring buffer, that keeps only the newest frames. A blocking buffer keeps every frame instead:
+    it is taken in order, and adding a frame waits while the buffer is full.
+    """
+
+    def __init__(self, size: int = 2, blocking: bool = False):
+        """
+        Inits the frame buffer.
+        :param size: the maximum number of frames held, older frames are overwritten unless blocking.
+        :param blocking: keep every frame, e.g. of a video, that can be read faster than it is evaluated
+        """
+        self.blocking = blocking
+        self._frames = deque(maxlen=None if blocking else size)
+        self._size = size
+        self._condition = threading.Condition()
+        self._closed = False
+
+    def put(self, frame: Frame):
+        """
+        Adds a frame, drops the oldest one if the buffer is full. A blocking buffer waits for a free slot instead,
+        the frame is dropped if the buffer is closed meanwhile.
+        :param frame: The newly captured frame.
+        :return: void.
+        """
+        with self._condition:
+            if self.blocking:
+                while len(self._frames) >= self._size and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+            self._frames.append(frame)
+            self._condition.notify_all()
+
+    def _take(self) -> Frame:
+        if self.blocking:
+            frame = self._frames.popleft()
+            self._condition.notify_all()  # wakes up the capture, if it waits for a free slot
+            return frame
+        frame = self._frames.pop()
+        self._frames.clear()
+        return frame
+
+    def latest(self):
+        """
+        Waits for a frame and takes the newest one. All older frames are discarded.
+        A blocking buffer returns the oldest frame instead, and discards none.
+        :return: The newest frame, None if the buffer was closed.
+        """
+        with self._condition:
+            while not self._frames and not self._closed:
+                self._condition.wait()
+            if not self._frames:
+                return None
+            return self._take()
+
+    def poll(self):
+        """
+        Takes the newest frame without waiting. All older frames are discarded.
+        A blocking buffer returns the oldest frame instead, and discards none.
+        :return: The newest frame, None if there is none yet.
+        """
+        with self._condition:
+            if not self._frames:
+                return None
+            return self._take()
+
+    @property
+    def closed(self) -> bool:
+        """
+        Whether the capture has ended and all frames were taken.
+        :return: True, if no more frames will come, False otherwise.
+        """
+        return self._closed and not self._frames
+
+    def close(self):
+        """
+        Closes the buffer, wakes up everyone waiting for a frame.
+        :return: void.
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+
+class CameraCapture(threading.Thread):
+    """Reads the camera on its own thread, so that the camera's internal buffer never fills up."""
+
+    def __init__(self, camera=0, buffer_size: int = 2, tracer: Tracer = None):
+        """
+        Inits the camera capture.
+        :param camera: the index of the camera or the path of a video, as passed to cv2.VideoCapture
+        :param buffer_size: the number of newest frames that are kept
+        :param tracer: records how long reading a frame takes, optional
+        """
+        super().__init__(name='CameraCapture', daemon=True)
+        self.camera = camera
+        self.tracer = tracer if tracer is not None else Tracer()
+        # a video is read faster than it is evaluated, but none of its frames are stale
+        self.buffer = FrameBuffer(buffer_size, blocking=isinstance(camera, str))
+        self.frames_captured = 0
+        self._stop_event = threading.Event()
+
+    def run(self):
+        """
+        Reads frames until stopped or the camera is closed.
+        :return: void.
+        """
+        start = self.tracer.now()
+        cap = cv2.VideoCapture(self.camera)  # init webcam input
+        self.tracer.span('open_camera', start)
+        try:
+            while cap.isOpened() and not self._stop_event.is_set():
+                start = self.tracer.now()
+                success, image = cap.read()
+                timestamp = time.perf_counter()
+                self.tracer.span('read', start, timestamp)
+                if not success:
+                    if isinstance(self.camera, str):
+                        break  # end of the video
+                    # print('empty camera frame ...')
+                    continue
+
+                self.buffer.put(Frame(image, timestamp, self.frames_captured))
+                self.frames_captured += 1
+        finally:
+            cap.release()
+            self.buffer.close()
+
+    def stop(self):
+        """
+        Stops capturing and releases the camera.
+        :return: void.
+        """
+        self._stop_event.set()
+        if self.buffer.blocking:
+            self.buffer.close()  # wakes up the capture, if it waits for a free slot
@@ -0,0 +1,82 @@
+import numpy as np
+
+from hand.Detection import *
+from helpers.Lazy import *
+
+cv2 = lazy_import('cv2')
+
+
+class MotionGate(object):
+    """
+    Decides whether a frame has to be passed on to inference. While the user holds a pose, the frames
+    hardly differ, so the previous result can be reused. The frame is compared, downsampled and in gray,
+    inside the region of the last detected hands against the frame that was last passed on to inference.
+    """
+
+    def __init__(self, threshold: float = 2.0, force_every: int = 10, size: int = 32, margin: float = 0.1):
+        """
+        Inits the motion gate.
+        :param threshold: the mean absolute difference (gray levels 0 - 255), below which a frame is static
+        :param force_every: the maximum number of frames, after which inference is forced
+        :param size: the side length in pixels of the downsampled region
+        :param margin: the margin added on each side of the hands' bounding box, relative to the frame
+        """
+        self.threshold = threshold
+        self.force_every = force_every
+        self.size = size
+        self.margin = margin
+
+        self.skipped = 0  # frames, whose previous result was reused
+        self.processed = 0  # frames, that were passed on to inference
+        self.score = 0.0  # the latest difference score
+
+        self._region = None
+        self._reference = None
+        self._since_processed = 0
+
+    def _downsample(self, image: np.ndarray) -> np.ndarray:
+        """
+        Downsamples the region of the image to a small gray image.
+        :param image: The full frame (RGB).
+        :return: The (size, size) gray image of the region.
+        """
+        x0, y0, x1, y1 = self._region
+        small = cv2.resize(image[y0:y1, x0:x1], (self.size, self.size), interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(small, cv2.COLOR_RGB2GRAY)
+
+    def is_static(self, image: np.ndarray) -> bool:
+        """
+        Determines whether the frame may reuse the previous result.
+        :param image: The full frame (RGB).
+        :return: True, if inference can be skipped, False otherwise.
+        """
+        if self._reference is None or self._since_processed + 1 >= self.force_every:
+            return False
+
+        self.score = float(cv2.absdiff(self._downsample(image), self._reference).mean())
+        if self.score >= self.threshold:
+            return False
+
+        self._since_processed += 1
+        self.skipped += 1
+        return True
+
+    def processed_frame(self, image: np.ndarray, hands: DetectedHands):
+        """
+        Takes the frame, that was passed on to inference, as reference for the following frames.
+        :param image: The full frame (RGB).
+        :param hands: The hands detected in the frame, in full frame coordinates.
+        :return: void.
+        """
+        height, width = image.shape[:2]
+        if len(hands) > 0:
+            points = hands.landmarks[..., :2].reshape(-1, 2)
+            x_min, y_min = np.clip(points.min(axis=0) - self.margin, 0.0, 1.0) * (width, height)
+            x_max, y_max = np.clip(points.max(axis=0) + self.margin, 0.0, 1.0) * (width, height)
+            self._region = (int(x_min), int(y_min), max(int(x_max), int(x_min) + 1), max(int(y_max), int(y_min) + 1))
+        else:
+            self._region = (0, 0, width, height)
+
+        self._reference = self._downsample(image)
+        self._since_processed = 0
+        self.processed += 1
@@ -0,0 +1,50 @@
+import numpy as np
+
+from hand.Detection import *
+from helpers.Lazy import *
+
+cv2 = lazy_import('cv2')
+
+
+class FramePreprocessor(object):
+    """
+    Prepares the camera frames (BGR) for inference (RGB, mirrored for the selfie view). The image is written into
+    a buffer, that is allocated once and reused for every frame, so it is only valid until the next frame.
+    Without flip, the frame is not mirrored at all, the detected hands are mirrored instead (see to_selfie_view).
+    """
+
+    def __init__(self, flip: bool = True):
+        """
+        Inits the preprocessor.
+        :param flip: mirror the frames, otherwise the landmarks are mirrored after inference
+        """
+        self.flip = flip
+        self._buffer = None
+
+    def process(self, image: np.ndarray) -> np.ndarray:
+        """
+        Converts a camera frame into the image passed on to inference.
+        :param image: The camera frame (BGR), is not changed.
+        :return: The image (RGB, read-only), overwritten by the next frame.
+        """
+        buffer = self._buffer
+        if buffer is None or buffer.shape != image.shape:
+            buffer = self._buffer = np.empty_like(image)
+        buffer.flags.writeable = True
+        cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=buffer)
+        if self.flip:
+            # flipping in place, no second buffer is needed
+            cv2.flip(buffer, 1, dst=buffer)
+        buffer.flags.writeable = False
+        return buffer
+
+    def to_selfie_view(self, hands: DetectedHands) -> DetectedHands:
+        """
+        Brings the hands detected on the image into the coordinates and the handedness of the mirrored frame,
+        as the classification expects them.
+        :param hands: The hands detected on the image, in full frame coordinates.
+        :return: The hands as if the frame had been mirrored.
+        """
+        if self.flip or len(hands) == 0:
+            return hands
+        return mirror_hands(hands)
@@ -0,0 +1,127 @@
+import numpy as np
+
+from hand.Detection import *
+from helpers.Lazy import *
+
+cv2 = lazy_import('cv2')
+
+
+class RegionOfInterest(object):
+
+    def __init__(self, x: int, y: int, width: int, height: int):
+        """
+        Inits a region of interest.
+        :param x: the left edge in pixels of the full frame
+        :param y: the top edge in pixels of the full frame
+        :param width: the width in pixels
+        :param height: the height in pixels
+        """
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+
+    def contains(self, other) -> bool:
+        """
+        Determines whether another region lies inside this one.
+        :param other: The other region.
+        :return: True, if inside, False otherwise
+        """
+        return self.x <= other.x and self.y <= other.y \
+            and other.x + other.width <= self.x + self.width and other.y + other.height <= self.y + self.height
+
+    def area(self) -> int:
+        """
+        Calculates the area of the region.
+        :return: the region's area in pixels.
+        """
+        return self.width * self.height
+
+    def __str__(self):
+        return f"""RegionOfInterest: x = {self.x}, y = {self.y}, width = {self.width}, height = {self.height}"""
+
+
+class RoiTracker(object):
+    """
+    Keeps a region around the last detected hands, and crops and downscales the frames to it before
+    inference. Falls back to the full frame, as soon as not both hands were detected.
+    """
+
+    def __init__(self, margin: float = 0.25, max_size: int = 640):
+        """
+        Inits the tracker.
+        :param margin: the margin added on each side of the hands' bounding box, relative to its size
+        :param max_size: the maximum length in pixels of the longer side of the image passed to inference
+        """
+        self.margin = margin
+        self.max_size = max_size
+        self.roi = None
+
+    def crop(self, image: np.ndarray):
+        """
+        Crops the frame to the region of interest and downscales it to the maximum size.
+        :param image: The full frame.
+        :return: Tuple[the image for inference, the region it shows (the full frame if not tracking)].
+        """
+        height, width = image.shape[:2]
+        roi = self.roi if self.roi is not None else RegionOfInterest(0, 0, width, height)
+        cropped = image[roi.y:roi.y + roi.height, roi.x:roi.x + roi.width]
+
+        scale = self.max_size / max(roi.width, roi.height)
+        if scale < 1.0:
+            size = (max(1, round(roi.width * scale)), max(1, round(roi.height * scale)))
+            cropped = cv2.resize(cropped, size, interpolation=cv2.INTER_AREA)
+        elif self.roi is not None:
+            cropped = np.ascontiguousarray(cropped)
+
+        return cropped, roi
+
+    @staticmethod
+    def to_full_frame(hands: DetectedHands, roi: RegionOfInterest, frame_shape: tuple):
+        """
+        Maps the landmarks, detected on the cropped image, back into the full frame's coordinates (in place).
+        :param hands: The hands detected on the cropped image.
+        :param roi: The region, the cropped image shows.
+        :param frame_shape: The shape of the full frame.
+        :return: void.
+        """
+        height, width = frame_shape[:2]
+        if len(hands) == 0 or (roi.width == width and roi.height == height):
+            return
+        landmarks = hands.landmarks
+        landmarks[..., 0] = (roi.x + landmarks[..., 0] * roi.width) / width
+        landmarks[..., 1] = (roi.y + landmarks[..., 1] * roi.height) / height
+        # z has roughly the same scale as x
+        landmarks[..., 2] *= roi.width / width
+
+    def update(self, hands: DetectedHands, frame_shape: tuple):
+        """
+        Moves the region of interest to the detected hands. The region is kept as long as it still holds
+        the hands and is not much larger than needed, so that it does not jitter.
+        :param hands: The hands detected in the frame, in full frame coordinates.
+        :param frame_shape: The shape of the full frame.
+        :return: void.
+        """
+        if len(hands) < 2:
+            # tracking lost, search the full frame
+            self.roi = None
+            return
+
+        height, width = frame_shape[:2]
+        points = hands.landmarks[..., :2].reshape(-1, 2)
+        x_min, y_min = points.min(axis=0) * (width, height)
+        x_max, y_max = points.max(axis=0) * (width, height)
+        margin_x = (x_max - x_min) * self.margin
+        margin_y = (y_max - y_min) * self.margin
+
+        x0 = max(0, int(x_min - margin_x))
+        y0 = max(0, int(y_min - margin_y))
+        x1 = min(width, int(np.ceil(x_max + margin_x)))
+        y1 = min(height, int(np.ceil(y_max + margin_y)))
+        if x1 - x0 < 2 or y1 - y0 < 2:
+            self.roi = None
+            return
+
+        needed = RegionOfInterest(x0, y0, x1 - x0, y1 - y0)
+        if self.roi is None or not self.roi.contains(needed) or needed.area() < self.roi.area() / 2:
+            self.roi = needed
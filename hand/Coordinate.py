@@ -41,6 +41,11 @@ class HandCoordinateType:
     DIP = 2
     TIP = 3
 
+    # axes of a landmark
+    X = 0
+    Y = 1
+    Z = 2
+
     # keys are the number
     def get_as_dictionary(self) -> dict:
         """
@@ -0,0 +1,76 @@
+from typing import List
+
+import numpy as np
+
+
+class DetectedHands(object):
+    """
+    Compact result of one frame's hand detection. Holds per detected hand its label, score,
+    index and 21 landmarks, so that the MediaPipe results are only read once per frame.
+    """
+
+    RIGHT: str = 'Right'
+    LEFT: str = 'Left'
+
+    def __init__(self, labels: List[str], scores: List[float], indices: List[int], landmarks: np.ndarray):
+        """
+        Inits the detected hands.
+        :param labels: the label ('Left' or 'Right') of each hand
+        :param scores: the handedness score of each hand
+        :param indices: the handedness index of each hand
+        :param landmarks: the (n, 21, 3) landmarks (x, y, z) of each hand
+        """
+        self.labels = labels
+        self.scores = scores
+        self.indices = indices
+        self.landmarks = landmarks
+
+    def __len__(self):
+        return len(self.labels)
+
+    def __str__(self):
+        return f"""DetectedHands: {list(zip(self.labels, self.scores))}"""
+
+
+# no hands in the frame
+NO_HANDS: DetectedHands = DetectedHands([], [], [], np.zeros((0, 21, 3)))
+
+
+def mirror_hands(hands: DetectedHands) -> DetectedHands:
+    """
+    Mirrors the hands horizontally: the landmarks' x coordinates (in place) and the handedness.
+    :param hands: The detected hands.
+    :return: The mirrored hands.
+    """
+    hands.landmarks[..., 0] = 1.0 - hands.landmarks[..., 0]
+    labels = [DetectedHands.RIGHT if label == DetectedHands.LEFT else DetectedHands.LEFT for label in hands.labels]
+    # MediaPipe's handedness index is 0 for the left and 1 for the right hand
+    indices = [1 - index for index in hands.indices]
+    return DetectedHands(labels, hands.scores, indices, hands.landmarks)
+
+
+def decode_results(results) -> DetectedHands:
+    """
+    Reads the handedness and landmarks of MediaPipe's detection results by direct field access.
+    :param results: The detection results of mp.solutions.hands.Hands.process.
+    :return: The detected hands, no hands if nothing was detected.
+    """
+    if results.multi_handedness is None:
+        return NO_HANDS
+
+    labels = []
+    scores = []
+    indices = []
+    for handedness in results.multi_handedness:
+        # the classification list always holds exactly one entry
+        classification = handedness.classification[0]
+        labels.append(classification.label)
+        scores.append(classification.score)
+        indices.append(classification.index)
+
+    landmarks = np.array([
+        [(landmark.x, landmark.y, landmark.z) for landmark in hand_landmarks.landmark]
+        for hand_landmarks in results.multi_hand_landmarks
+    ])
+
+    return DetectedHands(labels, scores, indices, landmarks)
@@ -0,0 +1,192 @@
+import itertools
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+from hand.Detection import *
+from hand.Synthetic import *
+from helpers.Lazy import *
+from helpers.Pattern import *
+from recording.Recording import *
+from settings.Settings import *
+
+mp = lazy_import('mediapipe')
+
+
+class AbstractHandDetector(ABC):
+    """
+    Base class for the hand detection backends. A backend detects the hands in an image and returns them as
+    DetectedHands, so that nothing after the detection depends on the backend.
+    """
+
+    # the detection keeps no state across images, so it may serve the frames of several sources
+    SHAREABLE: bool = True
+
+    @abstractmethod
+    def detect(self, image: np.ndarray) -> DetectedHands:
+        """
+        Detects the hands in the image.
+        :param image: The image (RGB, read-only).
+        :return: The detected hands, in coordinates relative to the image.
+        """
+        pass
+
+    def warm_up(self, shape: tuple):
+        """
+        Runs a dummy detection, so that the first frame does not wait for the model's initialization.
+        :param shape: The shape of the frames, that will be passed.
+        :return: void.
+        """
+        self.detect(np.zeros(shape, dtype=np.uint8))
+
+    def close(self):
+        """
+        Releases the backend.
+        :return: void.
+        """
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class MediaPipeHandDetector(AbstractHandDetector):
+    """The hand detection of MediaPipe (mp.solutions.hands.Hands)."""
+
+    def __init__(self, static_image_mode: bool = False, max_num_hands: int = 2, model_complexity: int = None,
+                 min_detection_confidence: float = 0.5, min_tracking_confidence: float = 0.5):
+        """
+        Inits the detection.
+        :param static_image_mode: detect the hands in every image, instead of tracking them from frame to frame
+        :param max_num_hands: the maximum number of hands, that are detected
+        :param model_complexity: 0 for the lite, 1 for the full landmark model, None for MediaPipe's default
+        :param min_detection_confidence: the minimum confidence, at which a hand is detected
+        :param min_tracking_confidence: the minimum confidence, at which a hand is still tracked
+        """
+        options = dict(static_image_mode=static_image_mode, max_num_hands=max_num_hands,
+                       min_detection_confidence=min_detection_confidence,
+                       min_tracking_confidence=min_tracking_confidence)
+        if model_complexity is not None:
+            # older MediaPipe versions do not know this option
+            options['model_complexity'] = model_complexity
+        self._hands = mp.solutions.hands.Hands(**options)
+
+    def detect(self, image: np.ndarray) -> DetectedHands:
+        return decode_results(self._hands.process(image))
+
+    def close(self):
+        self._hands.close()
+
+
+class ScriptedHandDetector(AbstractHandDetector):
+    """
+    Returns scripted hands instead of detecting them, regardless of the image, e.g. to run the pipeline in tests
+    and benchmarks without MediaPipe. The script holds the hands as the classification expects them (the hands
+    of the mirrored frame). With a region of interest, the images are cropped, so it must not be used.
+    """
+
+    # the position in the script is the state of one source
+    SHAREABLE: bool = False
+
+    def __init__(self, script, repeat: bool = False, mirror: bool = False, settings=Settings):
+        """
+        Inits the detector.
+        :param script: the hands of the consecutive frames: DetectedHands, braille patterns (synthetic hands)
+                       or None (no hands)
+        :param repeat: start over at the end of the script, otherwise there are no hands anymore
+        :param mirror: return the hands as detected on frames, that are not mirrored (Settings.MIRROR_LANDMARKS)
+        :param settings: the settings, that the braille patterns are read with
+        """
+        self.script = list(script)
+        self.mirror = mirror
+        self.settings = settings
+        self._frames = itertools.cycle(self.script) if repeat else iter(self.script)
+
+    @staticmethod
+    def parse(script: str) -> list:
+        """
+        Reads a script: a landmark recording, or braille patterns separated by whitespace ('-' for no hands).
+        :param script: The path of a recording (.npy) or the patterns, e.g. '145 145 - 1'.
+        :return: The script.
+        """
+        if script.endswith('.npy'):
+            return [hands for _, hands in LandmarkRecording(script)]
+        return [None if points == '-' else pattern_from_string(points) for points in script.split()]
+
+    def detect(self, image: np.ndarray) -> DetectedHands:
+        hands = next(self._frames, None)
+        if hands is None:
+            return NO_HANDS
+        if isinstance(hands, DetectedHands):
+            # the hands are changed later on, the script is not
+            hands = DetectedHands(list(hands.labels), list(hands.scores), list(hands.indices), hands.landmarks.copy())
+        else:
+            hands = synthetic_hands(hands, settings=self.settings)
+        return mirror_hands(hands) if self.mirror else hands
+
+    def warm_up(self, shape: tuple):
+        pass  # nothing to initialize, and the script must not be consumed
+
+
+def _mediapipe_detector(settings, **options) -> MediaPipeHandDetector:
+    arguments = dict(max_num_hands=settings.DETECTOR_MAX_HANDS, model_complexity=settings.DETECTOR_MODEL_COMPLEXITY,
+                     min_detection_confidence=settings.DETECTOR_MIN_DETECTION_CONFIDENCE,
+                     min_tracking_confidence=settings.DETECTOR_MIN_TRACKING_CONFIDENCE)
+    arguments.update(options)
+    return MediaPipeHandDetector(**arguments)
+
+
+def _mediapipe_lite_detector(settings, **options) -> MediaPipeHandDetector:
+    options.setdefault('model_complexity', 0)
+    return _mediapipe_detector(settings, **options)
+
+
+def _scripted_detector(settings, **options) -> ScriptedHandDetector:
+    # static_image_mode etc. are options of real detections
+    return ScriptedHandDetector(ScriptedHandDetector.parse(settings.DETECTOR_SCRIPT or ''),
+                                mirror=settings.MIRROR_LANDMARKS, settings=settings)
+
+
+# the hand detection backends by name, each created by a function of the settings and options of the detection
+DETECTORS: dict = {
+    'mediapipe': _mediapipe_detector,
+    'mediapipe-lite': _mediapipe_lite_detector,  # MediaPipe's lite landmark model, for slow CPUs
+    'scripted': _scripted_detector
+}
+
+
+def register_detector(name: str, factory):
+    """
+    Adds a hand detection backend, e.g. a lighter model for CPUs, that MediaPipe is too slow on.
+    :param name: The name of the backend, as used in Settings.DETECTOR.
+    :param factory: Creates the backend: factory(settings, **options) -> AbstractHandDetector.
+    :return: void.
+    """
+    DETECTORS[name] = factory
+
+
+def detector_settings(settings=Settings) -> tuple:
+    """
+    The settings, that the hand detection is built with, e.g. to tell whether a detection fits other settings.
+    :param settings: The settings.
+    :return: Tuples of the name and the value of the settings.
+    """
+    names = sorted(name for name in dir(settings) if name.startswith('DETECTOR_')) + ['MIRROR_LANDMARKS']
+    return tuple((name, getattr(settings, name)) for name in names)
+
+
+def create_hand_detector(settings=Settings, name: str = None, **options) -> AbstractHandDetector:
+    """
+    Creates the hand detection backend, that the settings describe.
+    :param settings: The settings, see Settings.DETECTOR.
+    :param name: The name of the backend, Settings.DETECTOR if None.
+    :param options: Options of the backend's detection, e.g. static_image_mode=True.
+    :return: The hand detection.
+    """
+    name = name if name is not None else settings.DETECTOR
+    if name not in DETECTORS:
+        raise ValueError(f'unknown hand detector: {name}')
+    return DETECTORS[name](settings, **options)
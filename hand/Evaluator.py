@@ -0,0 +1,161 @@
+import math
+
+import numpy as np
+
+from hand.Coordinate import *
+from helpers.Pattern import *
+from settings.Settings import *
+
+
+class HandPairEvaluator(object):
+    """
+    Evaluates all ten fingers of a hand pair at once. The landmarks of both hands are
+    held in one (2, 21, 3) array, so a frame is classified in a few vectorized operations
+    instead of building Finger objects for every finger.
+    """
+
+    # slots of the hands inside the landmark array
+    LEFT: int = 0
+    RIGHT: int = 1
+
+    # distance of the thumb's tip from the palm's circle, in radii, at which the thumb is certain
+    THUMB_MARGIN: float = 0.25
+
+    # the finger's landmarks, in the order thumb, index, middle, ring and kinky finger
+    FINGER_MCPS = np.array([
+        HandCoordinateType.INDEX_FINGER_MCP,
+        HandCoordinateType.MIDDLE_FINGER_MCP,
+        HandCoordinateType.RING_FINGER_MCP,
+        HandCoordinateType.PINKY_FINGER_MCP
+    ])
+    FINGER_TIPS = np.array([
+        HandCoordinateType.INDEX_FINGER_TIP,
+        HandCoordinateType.MIDDLE_FINGER_TIP,
+        HandCoordinateType.RING_FINGER_TIP,
+        HandCoordinateType.PINKY_FINGER_TIP
+    ])
+
+    def __init__(self, settings=Settings):
+        """
+        Inits the evaluator. Precomputes the braille point of every finger and the
+        cosine of the angle, at which a finger counts as stretched.
+        :param settings: the settings, that define the fingers' braille points and the angle
+        """
+        self.settings = settings
+        self._angle = None
+        self._cos_angle = 0.0
+        self.refresh()
+
+    def refresh(self):
+        """
+        Reloads the finger to braille point mapping and the angle from the settings.
+        :return: void.
+        """
+        self._angle = self.settings.ANGLE
+        self._cos_angle = math.cos(math.radians(self.settings.ANGLE))
+        points = np.array([
+            [self.settings.LEFT_THUMB, self.settings.LEFT_INDEX, self.settings.LEFT_MIDDLE, self.settings.LEFT_RING,
+             self.settings.LEFT_KINKY],
+            [self.settings.RIGHT_THUMB, self.settings.RIGHT_INDEX, self.settings.RIGHT_MIDDLE, self.settings.RIGHT_RING,
+             self.settings.RIGHT_KINKY]
+        ])
+        self._weights = np.left_shift(1, points)
+
+    def _measure(self, landmarks: np.ndarray):
+        """
+        Measures the fingers of both hands, see stretched.
+        :param landmarks: the (2, 21, 3) landmarks of the left and the right hand
+        :return: Tuple[the thumb tips' squared distance to the palm's middle point, the palms' squared radius,
+                 the (2, 4) dot products and the (2, 4) products of the norms of mcp->wrist and mcp->tip]
+        """
+        if self._angle != self.settings.ANGLE:
+            self.refresh()
+
+        # thumb: squared distance of the tip to the palm's middle point against the squared radius
+        index_mcp = landmarks[:, HandCoordinateType.INDEX_FINGER_MCP, :2]
+        kinky_mcp = landmarks[:, HandCoordinateType.PINKY_FINGER_MCP, :2]
+        to_tip = landmarks[:, HandCoordinateType.THUMB_TIP, :2] - (index_mcp + kinky_mcp) * 0.5
+        palm = index_mcp - kinky_mcp
+        thumb_distance = np.einsum('hi,hi->h', to_tip, to_tip)
+        thumb_radius = np.einsum('hi,hi->h', palm, palm) / 2.25
+
+        # other fingers: cosine of the angle wrist-mcp-tip, using the dot product
+        mcp = landmarks[:, self.FINGER_MCPS]
+        mcp_wrist = landmarks[:, HandCoordinateType.WRIST, None] - mcp
+        mcp_tip = landmarks[:, self.FINGER_TIPS] - mcp
+        dot = np.einsum('hfi,hfi->hf', mcp_wrist, mcp_tip)
+        norms = np.sqrt(np.einsum('hfi,hfi->hf', mcp_wrist, mcp_wrist) * np.einsum('hfi,hfi->hf', mcp_tip, mcp_tip))
+
+        # debug printing
+        if self.settings.PRINT_ANGLE:
+            with np.errstate(invalid='ignore', divide='ignore'):
+                print(f'angles: {np.degrees(np.arccos(np.clip(dot / norms, -1.0, 1.0)))}')
+
+        return thumb_distance, thumb_radius, dot, norms
+
+    def _stretched(self, measures: tuple, present: np.ndarray) -> np.ndarray:
+        """
+        Determines the stretched fingers from the measures, see stretched.
+        :param measures: the measures of the fingers, see _measure
+        :param present: the (2,) mask, that tells which of both hands is visible
+        :return: a (2, 5) boolean array (hand, finger)
+        """
+        thumb_distance, thumb_radius, dot, norms = measures
+        result = np.empty((2, 5), dtype=bool)
+        result[:, 0] = thumb_distance > thumb_radius
+        result[:, 1:] = ~(dot > self._cos_angle * norms)
+        result &= present[:, None]
+        return result
+
+    def stretched(self, landmarks: np.ndarray, present: np.ndarray) -> np.ndarray:
+        """
+        Determines for all fingers of both hands, whether they are stretched or not.
+            thumb: stretched, iff the thumb's tip (x and y) lies outside the palm's circle, which is
+            described by the middle point of the kinky and index finger's mcp and the distance of both
+            divided by 1.5 as radius. Squared distances are compared.
+            other: stretched, iff the angle between mcp->wrist and mcp->tip is at least Settings.ANGLE,
+            i.e. the cosine of the angle is at most cos(Settings.ANGLE).
+        :param landmarks: the (2, 21, 3) landmarks of the left and the right hand
+        :param present: the (2,) mask, that tells which of both hands is visible
+        :return: a (2, 5) boolean array (hand, finger), missing hands have no stretched fingers
+        """
+        return self._stretched(self._measure(landmarks), present)
+
+    def evaluate_with_certainty(self, landmarks: np.ndarray, present: np.ndarray):
+        """
+        Evaluates the hand pair like evaluate, and tells how certain the pattern is: a finger is certain,
+        if its angle is at least Settings.VOTE_ANGLE_MARGIN degrees away from Settings.ANGLE (the thumb's tip
+        at least THUMB_MARGIN radii away from the palm's circle). The least certain finger decides.
+        :param landmarks: the (2, 21, 3) landmarks of the left and the right hand
+        :param present: the (2,) mask, that tells which of both hands is visible
+        :return: Tuple[the bitmask of all active braille points, the certainty between 0 and 1]
+        """
+        measures = self._measure(landmarks)
+        pattern = int(self._weights[self._stretched(measures, present)].sum())
+        if self.settings.INVERT:
+            pattern ^= ALL_POINTS
+
+        if not present.any():
+            return pattern, 0.0
+        thumb_distance, thumb_radius, dot, norms = measures
+        with np.errstate(invalid='ignore', divide='ignore'):
+            thumb = np.abs(np.sqrt(thumb_distance / thumb_radius) - 1.0) / self.THUMB_MARGIN
+            angles = np.degrees(np.arccos(np.clip(dot / norms, -1.0, 1.0)))
+            others = np.abs(angles - self.settings.ANGLE) / self.settings.VOTE_ANGLE_MARGIN
+        margins = np.concatenate((thumb[:, None], others), axis=1)[present]
+        certainty = float(np.nan_to_num(margins.min(), nan=0.0))
+        return pattern, min(certainty, 1.0)
+
+    def evaluate(self, landmarks: np.ndarray, present: np.ndarray) -> int:
+        """
+        Evaluates the hand pair to a braille pattern, where bit i is set iff braille point i is active.
+        The Settings.INVERT variable determines, if stretched fingers correspond
+        to active braille dots and vice versa.
+        :param landmarks: the (2, 21, 3) landmarks of the left and the right hand
+        :param present: the (2,) mask, that tells which of both hands is visible
+        :return: the bitmask of all active braille points
+        """
+        pattern = int(self._weights[self.stretched(landmarks, present)].sum())
+        if self.settings.INVERT:
+            pattern ^= ALL_POINTS
+        return pattern
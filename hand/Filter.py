@@ -0,0 +1,93 @@
+import math
+
+import numpy as np
+
+from hand.Detection import *
+
+
+class OneEuroFilter(object):
+    """
+    Adaptive low-pass filter (One Euro filter) for the landmarks of both hands. While a hand is held still,
+    the cutoff frequency is low and the jitter is smoothed away; the faster it moves, the higher the cutoff,
+    so that the filter does not lag behind. All 42 landmarks are filtered at once, in a (2, 21, 3) state,
+    whose slots are the left and the right hand. A hand's state is reset, as soon as it is not detected.
+    """
+
+    # slots of the hands inside the state
+    SLOTS: dict = {DetectedHands.LEFT: 0, DetectedHands.RIGHT: 1}
+
+    def __init__(self, min_cutoff: float = 1.5, beta: float = 5.0, d_cutoff: float = 1.0):
+        """
+        Inits the filter.
+        :param min_cutoff: the cutoff frequency in Hz of a hand held still
+        :param beta: how fast the cutoff frequency rises with the landmarks' speed
+        :param d_cutoff: the cutoff frequency in Hz of the speed
+        """
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+
+        self._x = np.zeros((2, 21, 3))  # filtered landmarks
+        self._dx = np.zeros((2, 21, 3))  # filtered speed
+        self._t = np.zeros(2)  # timestamp of the last update
+        self._active = np.zeros(2, dtype=bool)  # the slot holds a hand
+
+    def reset(self):
+        """
+        Forgets both hands.
+        :return: void.
+        """
+        self._active[:] = False
+
+    @staticmethod
+    def _alpha(cutoff, dt: np.ndarray) -> np.ndarray:
+        """
+        The smoothing factor of an exponential filter.
+        :param cutoff: The cutoff frequency in Hz, a scalar or an array.
+        :param dt: The seconds since the last update, broadcastable to cutoff.
+        :return: The smoothing factor.
+        """
+        tau = 1.0 / (2 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def filter(self, hands: DetectedHands, timestamp: float) -> DetectedHands:
+        """
+        Filters the landmarks of the detected hands.
+        :param hands: The detected hands of the frame.
+        :param timestamp: The capture time of the frame in seconds.
+        :return: The detected hands with filtered landmarks (the given hands are not changed).
+        """
+        slots = [self.SLOTS.get(label, -1) for label in hands.labels]
+        if len(set(slots)) != len(slots) or -1 in slots:
+            # the hands cannot be told apart, start over
+            self.reset()
+            return hands
+
+        present = np.zeros(2, dtype=bool)
+        present[slots] = True
+        self._active &= present
+        if not slots:
+            return hands
+
+        index = np.array(slots)
+        x = hands.landmarks
+        new = ~self._active[index]
+        if new.any():
+            # a hand, that was not detected before, starts at rest
+            self._x[index[new]] = x[new]
+            self._dx[index[new]] = 0.0
+        # both hands in order are the usual case, then the state is read and written through views
+        slots = slice(0, 2) if slots == [0, 1] else index
+
+        dt = np.maximum(timestamp - self._t[slots], 1e-6)[:, None, None]
+        x_prev = self._x[slots]
+        dx_prev = self._dx[slots]
+        dx_hat = dx_prev + self._alpha(self.d_cutoff, dt) * ((x - x_prev) / dt - dx_prev)
+        alpha = self._alpha(self.min_cutoff + self.beta * np.abs(dx_hat), dt)
+        x_hat = x_prev + alpha * (x - x_prev)
+
+        self._x[slots] = x_hat
+        self._dx[slots] = dx_hat
+        self._t[slots] = timestamp
+        self._active[slots] = True
+        return DetectedHands(hands.labels, hands.scores, hands.indices, x_hat)
@@ -1,9 +1,10 @@
-from protobuf_to_dict import protobuf_to_dict
 from typing import Tuple, List
 import numpy as np
 
 from helpers.Shape import *
 from hand.Coordinate import *
+from hand.Detection import *
+from hand.Evaluator import *
 from settings.Settings import *
 
 
@@ -12,160 +13,89 @@ class HandPair(object):
     NOT_TWO_HANDS: str = "Keine zwei Hände im Bild!"
     TWO_SAME_HANDS: str = "Zwei gleiche Hände!"
 
-    def __init__(self):
+    # evaluates both hands at once, shared by all hand pairs
+    _evaluator: HandPairEvaluator = HandPairEvaluator()
+
+    def __init__(self, evaluator: HandPairEvaluator = None):
         """
         constructor for a hand pair, holds a left and right hand
+        :param evaluator: evaluates the hand pair, the shared one if None (e.g. a session's own evaluator)
         """
+        if evaluator is not None:
+            self._evaluator = evaluator
         self.left_hand = None
         self.right_hand = None
 
-    def is_valid(self, result_multi_handedness: list) -> Tuple[bool, str]:
+        # the landmarks of the left and right hand, as evaluated by the evaluator
+        self.landmarks = np.zeros((2, 21, 3))
+        self.present = np.zeros(2, dtype=bool)
+
+    def is_valid(self, hands: DetectedHands) -> Tuple[bool, str]:
         """
         Checks if the detection results are a valid handpair
         A handpair is valid,
             iff there are exactly two hands
             and one hand is a left hand
             and the other hand is a right hand
-        :param result_multi_handedness: the detection results
+        :param hands: the decoded detection results
         :return: Tuple[true, '']: iff the detection results represent a valid handpair
                  Tuple[false, error message]: iff the result is an invalid pair of hands,
                                               the error message tells, whether two identical
                                               hands are visible, or not two hands were detected.
         """
 
-        if len(result_multi_handedness) != 2:
+        if len(hands) != 2:
             return False, self.NOT_TWO_HANDS
 
-        # convert from protobuf message to python's dictionary
-        # https://github.com/google/mediapipe/issues/1374
-
-        dict_hand_a = protobuf_to_dict(result_multi_handedness[0])
-        dict_hand_b = protobuf_to_dict(result_multi_handedness[1])
-
-        # get each hand's label
-        label_hand_a = dict_hand_a['classification'][0]['label']
-        label_hand_b = dict_hand_b['classification'][0]['label']
-
-        if label_hand_a == label_hand_b:
+        if hands.labels[0] == hands.labels[1]:
             return False, self.TWO_SAME_HANDS
 
         return True, ''
 
-    def define_hands(self, result):
+    def define_hands(self, hands: DetectedHands):
         """
         Inits left and right hand of the hand pair.
-        :param result: The detection results
+        :param hands: The decoded detection results
         :return:
         """
-        dict_hand_a = protobuf_to_dict(result.multi_handedness[0])
-        landmarks_a = protobuf_to_dict(result.multi_hand_landmarks[0])['landmark']
-
-        if len(result.multi_handedness) == 2:
-            dict_hand_b = protobuf_to_dict(result.multi_handedness[1])
-            landmarks_b = protobuf_to_dict(result.multi_hand_landmarks[1])['landmark']
-        else:
-            dict_hand_b = None
-
-        # dictionary = dict['classification'] # -> is a list
-        # len(dictionary) # is always 1, so -> dictionary[0]
-        # dictionary[0] -> is a dict
-        # dictionary[0] keys are: index score label
-
-        label_a = dict_hand_a['classification'][0]['label']
-        index_a = dict_hand_a['classification'][0]['index']
-        score_a = dict_hand_a['classification'][0]['score']
-
-        if dict_hand_b is not None:
-            label_b = dict_hand_b['classification'][0]['label']
-            index_b = dict_hand_b['classification'][0]['index']
-            score_b = dict_hand_b['classification'][0]['score']
-
-        if label_a == 'Right':
-            self.right_hand = Hand(index_a, score_a, label_a, landmarks_a)
-            if dict_hand_b is not None:
-                self.left_hand = Hand(index_b, score_b, label_b, landmarks_b)
-            else:
-                self.left_hand = None
+        # the first hand decides, the second one (if any) takes the other side
+        if hands.labels[0] == DetectedHands.RIGHT:
+            slots = (HandPairEvaluator.RIGHT, HandPairEvaluator.LEFT)
         else:
-            self.left_hand = Hand(index_a, score_a, label_a, landmarks_a)
-            if dict_hand_b is not None:
-                self.right_hand = Hand(index_b, score_b, label_b, landmarks_b)
+            slots = (HandPairEvaluator.LEFT, HandPairEvaluator.RIGHT)
+
+        for i in range(min(len(hands), 2)):
+            hand = Hand(hands.indices[i], hands.scores[i], hands.labels[i], hands.landmarks[i])
+            self.landmarks[slots[i]] = hands.landmarks[i]
+            self.present[slots[i]] = True
+            if slots[i] == HandPairEvaluator.RIGHT:
+                self.right_hand = hand
             else:
-                self.right_hand = None
+                self.left_hand = hand
 
-    def evaluate(self) -> str:
+    def evaluate(self) -> int:
         """
         evaluates the current handpair and maps it to the corresponding braille points
-        :return: a string, that contains all braille points (order ascending), that the handpair represents
+        :return: the braille pattern (bit i set iff point i is active), that the handpair represents
         """
-        
-        result = dict()
-        # init dict to default: all fingers not stretched
-        for i in range(0, 9):
-            result[i] = False
-
-        if self.left_hand is not None:
-            left_hand_eval = self.left_hand.evaluate()
-            for finger_type in left_hand_eval:
-                if finger_type is _FingerType.THUMB:
-                    result[Settings.LEFT_THUMB] = left_hand_eval[finger_type]
-                elif finger_type is _FingerType.INDEX_FINGER:
-                    result[Settings.LEFT_INDEX] = left_hand_eval[finger_type]
-                elif finger_type is _FingerType.MIDDLE_FINGER:
-                    result[Settings.LEFT_MIDDLE] = left_hand_eval[finger_type]
-                elif finger_type is _FingerType.RING_FINGER:
-                    result[Settings.LEFT_RING] = left_hand_eval[finger_type]
-                else:
-                    result[Settings.LEFT_KINKY] = left_hand_eval[finger_type]
-
-        if self.right_hand is not None:
-            right_hand_eval = self.right_hand.evaluate()
-            for finger_type in right_hand_eval:
-                if finger_type is _FingerType.THUMB:
-                    result[Settings.RIGHT_THUMB] = right_hand_eval[finger_type]
-                elif finger_type is _FingerType.INDEX_FINGER:
-                    result[Settings.RIGHT_INDEX] = right_hand_eval[finger_type]
-                elif finger_type is _FingerType.MIDDLE_FINGER:
-                    result[Settings.RIGHT_MIDDLE] = right_hand_eval[finger_type]
-                elif finger_type is _FingerType.RING_FINGER:
-                    result[Settings.RIGHT_RING] = right_hand_eval[finger_type]
-                else:
-                    result[Settings.RIGHT_KINKY] = right_hand_eval[finger_type]
-
-        return self._map_to_string(result)
-
-    def _map_to_string(self, r_dict: dict) -> str:
-        """
-        maps the dictionary to a string, that represents the braille dots.
-        The Settings.INVERT variable determines, if stretched fingers correspond
-        to active braille dots and vice versa.
-        :param r_dict: the dictionary, that holds at key k the boolean value,
-                       that tells whether this finger is stretched (true) or not
-        :return: the string of all braille cells
-        """
-        
-        if Settings.INVERT:
-            result = '0123456789'
-            for key_index in r_dict:
-                if r_dict[key_index]:
-                    result = result.replace(str(key_index), "")
-            return result
-        else:
-            result = ''
-            for key_index in r_dict:
-                if r_dict[key_index]:
-                    result += str(key_index)
-            return result
+        return self._evaluator.evaluate(self.landmarks, self.present)
+
+    def evaluate_with_certainty(self) -> Tuple[int, float]:
+        """
+        evaluates the current handpair, see HandPairEvaluator.evaluate_with_certainty
+        :return: the braille pattern and its certainty between 0 and 1
+        """
+        return self._evaluator.evaluate_with_certainty(self.landmarks, self.present)
 
 
 class Finger(object):
 
     # last two parameters are needed to say if the thumb is stretched or not
-    def __init__(self, finger_type: int, landmarks: list, wrist, index_finger=None, kinky_finger=None):
+    def __init__(self, finger_type: int, landmarks: np.ndarray, wrist, index_finger=None, kinky_finger=None):
         """
 
         :param finger_type: the type of the finger
-        :param landmarks: the landmarks / coordinates of the finger
+        :param landmarks: the landmarks / coordinates of the finger, one row (x, y, z) each
         :param wrist: the wrist of the hand
         :param index_finger: optional, only needed if the finger is a thumb, the index finger of the same hand
         :param kinky_finger: optional, only needed if the finger is a thumb, the kinky finger of the same hand
@@ -189,7 +119,7 @@ class Finger(object):
         else:
             return False
 
-    def _coordinates(self, coord_index: int) -> dict:
+    def _coordinates(self, coord_index: int) -> np.ndarray:
         """
         Provides access to the index of the landmark
         :param coord_index: The index of the landmark that wants to be returned
@@ -211,25 +141,25 @@ class Finger(object):
         :return: whether a finger a stretched (true) or not (false)
         """
 
-        x_coord_tip = self._coordinates(HandCoordinateType.TIP)['x'] * 100
-        y_coord_tip = self._coordinates(HandCoordinateType.TIP)['y'] * 100
+        x_coord_tip = self._coordinates(HandCoordinateType.TIP)[HandCoordinateType.X] * 100
+        y_coord_tip = self._coordinates(HandCoordinateType.TIP)[HandCoordinateType.Y] * 100
         if self._is_thumb():
             # kinky finger's mcp point
-            x_coord_kinky_mcp = self.kinky_finger._coordinates(HandCoordinateType.MCP)['x'] * 100
-            y_coord_kinky_mcp = self.kinky_finger._coordinates(HandCoordinateType.MCP)['y'] * 100
+            x_coord_kinky_mcp = self.kinky_finger._coordinates(HandCoordinateType.MCP)[HandCoordinateType.X] * 100
+            y_coord_kinky_mcp = self.kinky_finger._coordinates(HandCoordinateType.MCP)[HandCoordinateType.Y] * 100
             kinky_point = Point2D(x_coord_kinky_mcp, y_coord_kinky_mcp)
 
             # index finger's mcp point
-            x_coord_index_mcp = self.index_finger._coordinates(HandCoordinateType.MCP)['x'] * 100
-            y_coord_index_mcp = self.index_finger._coordinates(HandCoordinateType.MCP)['y'] * 100
+            x_coord_index_mcp = self.index_finger._coordinates(HandCoordinateType.MCP)[HandCoordinateType.X] * 100
+            y_coord_index_mcp = self.index_finger._coordinates(HandCoordinateType.MCP)[HandCoordinateType.Y] * 100
             index_point = Point2D(x_coord_index_mcp, y_coord_index_mcp)
 
             # the circle similar to the hand's palm
             circle = Circle(middle_point(kinky_point, index_point), kinky_point.distance_to(index_point) / 1.5)
 
             # the thumb's tip point
-            thumb_point = Point2D(self._coordinates(HandCoordinateType.TIP)['x'] * 100,
-                                  self._coordinates(HandCoordinateType.TIP)['y'] * 100)
+            thumb_point = Point2D(self._coordinates(HandCoordinateType.TIP)[HandCoordinateType.X] * 100,
+                                  self._coordinates(HandCoordinateType.TIP)[HandCoordinateType.Y] * 100)
 
             if circle.contains(thumb_point):
                 return False
@@ -240,13 +170,13 @@ class Finger(object):
             # https://stackoverflow.com/questions/35176451/python-code-to-calculate-angle-between-three-point-using-their-3d-coordinates
 
             # define the wrist, mcp and tip as np arrays
-            wrist = np.array([self.wrist['x'] * 100, self.wrist['y'] * 100, self.wrist['z'] * 100])
+            wrist = np.array([self.wrist[HandCoordinateType.X] * 100, self.wrist[HandCoordinateType.Y] * 100, self.wrist[HandCoordinateType.Z] * 100])
             mcp = np.array(
-                [self._coordinates(HandCoordinateType.MCP)['x'] * 100,
-                 self._coordinates(HandCoordinateType.MCP)['y'] * 100,
-                 self._coordinates(HandCoordinateType.MCP)['z'] * 100]
+                [self._coordinates(HandCoordinateType.MCP)[HandCoordinateType.X] * 100,
+                 self._coordinates(HandCoordinateType.MCP)[HandCoordinateType.Y] * 100,
+                 self._coordinates(HandCoordinateType.MCP)[HandCoordinateType.Z] * 100]
             )
-            tip = np.array([x_coord_tip, y_coord_tip, self._coordinates(HandCoordinateType.TIP)['z'] * 100])
+            tip = np.array([x_coord_tip, y_coord_tip, self._coordinates(HandCoordinateType.TIP)[HandCoordinateType.Z] * 100])
 
             # calculate the vectors
             mcp_wrist = wrist - mcp
@@ -271,14 +201,14 @@ class Finger(object):
 
 class Hand(object):
 
-    def __init__(self, index: int, score: float, label: str, landmarks: list):
+    def __init__(self, index: int, score: float, label: str, landmarks: np.ndarray):
         """
         Inits a hand object.
 
         :param index: the hand's index of the detection
         :param score: the score of the detection
         :param label: the label (right or left) of the hand
-        :param landmarks: a list of all hand landmarks
+        :param landmarks: the (21, 3) array of all hand landmarks
         """
 
         self.index = index
@@ -286,9 +216,20 @@ class Hand(object):
         self.label = label
         self.landmarks = landmarks
         self._determine_hand()
-        self.fingers = self._determine_fingers()
+        self._fingers = None
         # self._is_finger_stretched(0)
 
+    @property
+    def fingers(self) -> List[Finger]:
+        """
+        The hand's fingers, only created on first access as the hand pair evaluates
+        the landmarks without them.
+        :return: a list of all fingers as objects
+        """
+        if self._fingers is None:
+            self._fingers = self._determine_fingers()
+        return self._fingers
+
     def evaluate(self):
         """
         Evaluates the hand.
@@ -297,7 +238,7 @@ class Hand(object):
         """
 
         result = dict()
-        for finger in self._determine_fingers():
+        for finger in self.fingers:
             result[finger.type] = finger.is_stretched()
 
         return result
@@ -0,0 +1,88 @@
+import numpy as np
+
+from hand.Coordinate import *
+from hand.Detection import *
+from settings.Settings import *
+
+
+# the x-coordinates of the hands' wrists
+_CENTERS = (0.3, 0.7)
+
+# offsets of the index, middle, ring and kinky finger's mcp from the wrist's x-coordinate
+_FINGER_OFFSETS = (0.06, 0.02, -0.02, -0.06)
+
+_WRIST_Y = 0.8
+_MCP_Y = 0.6
+
+
+def _finger_points(slot: int, settings=Settings) -> list:
+    """
+    The braille points of a hand's fingers, in the order thumb, index, middle, ring and kinky finger.
+    :param slot: 0 for the left hand, 1 for the right hand.
+    :param settings: the settings, that assign the points to the fingers.
+    :return: a list of the braille points.
+    """
+    if slot == 0:
+        return [settings.LEFT_THUMB, settings.LEFT_INDEX, settings.LEFT_MIDDLE, settings.LEFT_RING,
+                settings.LEFT_KINKY]
+    return [settings.RIGHT_THUMB, settings.RIGHT_INDEX, settings.RIGHT_MIDDLE, settings.RIGHT_RING,
+            settings.RIGHT_KINKY]
+
+
+def synthetic_hand(slot: int, stretched: list) -> np.ndarray:
+    """
+    Creates the landmarks of a hand, that holds its fingers as given.
+    :param slot: 0 for the left hand, 1 for the right hand.
+    :param stretched: five booleans, whether thumb, index, middle, ring and kinky finger are stretched.
+    :return: the (21, 3) landmarks of the hand.
+    """
+    center = _CENTERS[slot]
+    side = 1.0 if slot == 1 else -1.0
+    landmarks = np.zeros((21, 3))
+    landmarks[HandCoordinateType.WRIST] = (center, _WRIST_Y, 0.0)
+
+    # index to kinky finger: stretched fingers point up, bent ones curl back to the wrist
+    for finger, mcp in enumerate((HandCoordinateType.INDEX_FINGER_MCP, HandCoordinateType.MIDDLE_FINGER_MCP,
+                                  HandCoordinateType.RING_FINGER_MCP, HandCoordinateType.PINKY_FINGER_MCP)):
+        x = center + side * _FINGER_OFFSETS[finger]
+        if stretched[finger + 1]:
+            ys = (_MCP_Y, 0.52, 0.46, 0.40)
+            zs = (0.0, -0.01, -0.02, -0.03)
+        else:
+            ys = (_MCP_Y, 0.56, 0.62, 0.68)
+            zs = (0.0, -0.04, -0.06, -0.05)
+        for joint in range(4):
+            landmarks[mcp + joint] = (x, ys[joint], zs[joint])
+
+    # thumb: the tip lies outside the palm if stretched, inside otherwise
+    if stretched[0]:
+        tip = np.array([center + side * 0.2, 0.65, -0.02])
+    else:
+        tip = np.array([center, 0.62, -0.04])
+    wrist = landmarks[HandCoordinateType.WRIST]
+    for joint in range(4):
+        landmarks[HandCoordinateType.THUMB_CMC + joint] = wrist + (tip - wrist) * (joint + 1) / 4
+
+    return landmarks
+
+
+def synthetic_hands(pattern: int, jitter: float = 0.0, rng: np.random.Generator = None,
+                    settings=Settings) -> DetectedHands:
+    """
+    Creates a hand pair, that shows the braille pattern.
+    :param pattern: The braille pattern (see helpers.Pattern).
+    :param jitter: The standard deviation of the noise added to every landmark.
+    :param rng: The random generator for the noise.
+    :param settings: The settings, that the pattern is read with (the fingers' points, INVERT).
+    :return: The detected left and right hand.
+    """
+    landmarks = np.zeros((2, 21, 3))
+    for slot in (0, 1):
+        stretched = [bool(pattern & (1 << point)) != settings.INVERT for point in _finger_points(slot, settings)]
+        landmarks[slot] = synthetic_hand(slot, stretched)
+
+    if jitter > 0.0:
+        rng = rng if rng is not None else np.random.default_rng()
+        landmarks += rng.normal(0.0, jitter, landmarks.shape)
+
+    return DetectedHands([DetectedHands.LEFT, DetectedHands.RIGHT], [0.99, 0.99], [0, 1], landmarks)
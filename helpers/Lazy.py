@@ -0,0 +1,43 @@
+import importlib
+import threading
+import types
+
+
+class LazyModule(types.ModuleType):
+    """
+    Stands in for a heavy module (e.g. cv2 or mediapipe), that is imported on first use. So importing
+    AirBraille is fast, and the modules can be imported concurrently by the threads, that first need them.
+    """
+
+    def __init__(self, name: str):
+        """
+        Inits the stand-in, does not import the module yet.
+        :param name: the name of the module
+        """
+        super().__init__(name)
+        self._lock = threading.Lock()
+        self._module = None
+
+    def load(self) -> types.ModuleType:
+        """
+        Imports the module, if not done yet. Afterwards, its attributes are found on the stand-in directly.
+        :return: The module.
+        """
+        with self._lock:
+            if self._module is None:
+                module = importlib.import_module(self.__name__)
+                self.__dict__.update(module.__dict__)
+                self._module = module
+        return self._module
+
+    def __getattr__(self, name: str):
+        return getattr(self.load(), name)
+
+
+def lazy_import(name: str) -> LazyModule:
+    """
+    Imports a module on first use.
+    :param name: The name of the module.
+    :return: The stand-in of the module.
+    """
+    return LazyModule(name)
@@ -0,0 +1,30 @@
+# A braille pattern is an integer bitmask: bit i is set, iff braille point i is active.
+# Points 1 - 8 are the braille dots, 0 and 9 are the thumbs (see Settings).
+
+POINTS: int = 10
+ALL_POINTS: int = (1 << POINTS) - 1
+EMPTY_PATTERN: int = 0
+
+# the string form of every pattern, e.g. 0b10011 -> '014'
+_STRINGS = [''.join(str(i) for i in range(POINTS) if pattern & (1 << i)) for pattern in range(1 << POINTS)]
+
+
+def pattern_to_string(pattern: int) -> str:
+    """
+    Converts a pattern to its string form, only meant for debugging.
+    :param pattern: The pattern's bitmask.
+    :return: a string, that contains all braille points (order ascending)
+    """
+    return _STRINGS[pattern]
+
+
+def pattern_from_string(points: str) -> int:
+    """
+    Converts the string form of a pattern (e.g. from a braille file) to its bitmask.
+    :param points: The braille points, e.g. '145'.
+    :return: The pattern's bitmask.
+    """
+    pattern = EMPTY_PATTERN
+    for point in points:
+        pattern |= 1 << int(point)
+    return pattern
@@ -1,12 +1,71 @@
 # This script starts the detection.
 
+import argparse
+import signal
+
 from AirBraille import *
 from WriteHandler import *
 
 # sources
 six_dot_file = "braille_files/6_dot_AT.json" # https://fakoo.de/braille/braille-alphabet.html?mi2
 eight_dot_file = "braille_files/8_dot_AT.json" # https://fakoo.de/computerbraille.html
+six_dot_signs_file = "braille_files/6_dot_AT_signs.json" # capital and number signs
 
 if __name__ == '__main__':
-    air_braille = AirBraille(WriteHandler6Dot(six_dot_file))
-    air_braille.start_detection()
+    parser = argparse.ArgumentParser(description='Starts the detection of AirBraille.')
+    parser.add_argument('--record', metavar='FILE', help='record the landmarks of every frame to FILE')
+    parser.add_argument('--replay', metavar='FILE', help='replay a landmark recording instead of using the camera')
+    parser.add_argument('--realtime', action='store_true', help='replay at the recorded speed')
+    parser.add_argument('--contracted', action='store_true',
+                        help='translate sequences of cells, e.g. capital and number signs')
+    parser.add_argument('--output', metavar='SINK',
+                        help="where the text goes: 'print', 'keyboard', 'file:<path>' or 'socket:<host>:<port>'")
+    parser.add_argument('--flush', choices=[OutputSink.IMMEDIATE, OutputSink.WORD, OutputSink.TIMED],
+                        help='when the text is output')
+    parser.add_argument('--detector', choices=list(DETECTORS),
+                        help='the hand detection backend, e.g. mediapipe-lite for slow CPUs')
+    parser.add_argument('--headless', action='store_true',
+                        help='run without preview and debug output, stop with SIGINT or SIGTERM')
+    parser.add_argument('--trace', metavar='FILE', nargs='?', const='',
+                        help='report the latency of each stage, export a Chrome trace to FILE if given')
+    parser.add_argument('--metrics', metavar='PORT', type=int,
+                        help='serve the metrics, including the stage latencies, at http://127.0.0.1:PORT/metrics')
+    args = parser.parse_args()
+
+    if args.trace is not None:
+        Settings.TRACE = True
+        Settings.TRACE_FILE = args.trace or None
+
+    if args.metrics is not None:
+        Settings.METRICS_PORT = args.metrics
+    if args.headless:
+        Settings.HEADLESS = True
+    if args.detector:
+        Settings.DETECTOR = args.detector
+    if args.output:
+        Settings.OUTPUT = args.output
+    if args.flush:
+        Settings.OUTPUT_POLICY = args.flush
+
+    sink = create_output_sink()
+    if args.contracted:
+        write_handler = WriteHandlerContracted([six_dot_file, six_dot_signs_file], sink=sink)
+    else:
+        write_handler = WriteHandler6Dot(six_dot_file, sink=sink)
+
+    if args.replay:
+        air_braille = AirBraille(write_handler, speech=SilentSpeech())
+        seconds = replay(args.replay, air_braille, args.realtime)
+        print(f'replayed {args.replay} in {seconds:.3f}s')
+        if Settings.TRACE:
+            print(air_braille.tracer.report())
+            air_braille.tracer.export()
+    else:
+        if args.record:
+            Settings.RECORD_FILE = args.record
+        air_braille = AirBraille(write_handler)
+        for signal_number in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signal_number, lambda *_: air_braille.stop_detection())
+        air_braille.start_detection()
+    write_handler.flush()
+    sink.stop()
@@ -0,0 +1,184 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+
+class Metrics(object):
+    """
+    Counters and gauges of one AirBraille instance. They are only written by the thread evaluating the frames,
+    so they are plain attributes without locks; the metrics server reads them from its own thread.
+    """
+
+    # weight of the latest frame interval in the smoothed interval
+    FPS_SMOOTHING: float = 0.1
+    # seconds without a frame, after which the frame rate is 0
+    FPS_TIMEOUT: float = 1.0
+
+    def __init__(self):
+        self.frames_processed = 0  # frames evaluated
+        self.rejected_not_two_hands = 0  # hand pairs rejected, as not two hands were detected
+        self.rejected_same_hands = 0  # hand pairs rejected, as two left or two right hands were detected
+        self.decisions = 0  # patterns passed on to the write handler
+        self.decision_votes = 0  # the leader's votes, summed up over all decisions
+        self.characters = 0  # characters written
+        self.errors = 0  # error utterances, i.e. patterns without text
+        self._interval = None  # smoothed seconds between two frames
+        self._last_frame = None
+
+    def frame(self, now: float):
+        """
+        Counts an evaluated frame.
+        :param now: The time.perf_counter() value.
+        :return: void.
+        """
+        self.frames_processed += 1
+        if self._last_frame is not None:
+            interval = now - self._last_frame
+            if self._interval is None:
+                self._interval = interval
+            else:
+                self._interval += self.FPS_SMOOTHING * (interval - self._interval)
+        self._last_frame = now
+
+    def fps(self, now: float = None) -> float:
+        """
+        The current frame rate.
+        :param now: The time.perf_counter() value, now if None.
+        :return: The evaluated frames per second, smoothed.
+        """
+        now = now if now is not None else time.perf_counter()
+        last_frame, interval = self._last_frame, self._interval
+        if last_frame is None or interval is None or interval <= 0.0 or now - last_frame > self.FPS_TIMEOUT:
+            return 0.0
+        return 1.0 / interval
+
+
+class _Family(object):
+    """The samples of one metric, in the Prometheus text format."""
+
+    def __init__(self, name: str, kind: str, description: str):
+        self.name = name
+        self.kind = kind
+        self.description = description
+        self.samples = []
+
+    def add(self, value, labels: dict, suffix: str = ''):
+        self.samples.append((suffix, labels, value))
+
+    def lines(self) -> list:
+        lines = [f'# HELP {self.name} {self.description}', f'# TYPE {self.name} {self.kind}']
+        for suffix, labels, value in self.samples:
+            label_text = ','.join(f'{key}="{_escape(str(label))}"' for key, label in labels.items())
+            # counters are exact, however large they grow
+            number = str(value) if isinstance(value, int) else repr(float(value))
+            lines.append(f'{self.name}{suffix}{{{label_text}}} {number}')
+        return lines
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def format_metrics(air_brailles: dict) -> str:
+    """
+    Collects the metrics of AirBraille instances in the Prometheus text format.
+    :param air_brailles: The AirBraille instances by session name.
+    :return: The metrics.
+    """
+    families = dict()
+
+    def family(name: str, kind: str, description: str) -> _Family:
+        if name not in families:
+            families[name] = _Family(name, kind, description)
+        return families[name]
+
+    now = time.perf_counter()
+    for session, air_braille in air_brailles.items():
+        labels = {'session': session}
+        metrics = air_braille.metrics
+        family('airbraille_frames_captured_total', 'counter', 'Frames captured by the camera.').add(
+            air_braille.capture.frames_captured, labels)
+        family('airbraille_frames_processed_total', 'counter', 'Frames evaluated.').add(
+            metrics.frames_processed, labels)
+        family('airbraille_frames_dropped_total', 'counter', 'Frames captured, but never evaluated.').add(
+            air_braille.dropped_frames, labels)
+        rejections = family('airbraille_hand_pair_rejections_total', 'counter', 'Frames without a valid hand pair.')
+        rejections.add(metrics.rejected_not_two_hands, dict(labels, reason='not_two_hands'))
+        rejections.add(metrics.rejected_same_hands, dict(labels, reason='same_hand'))
+        votes = family('airbraille_decision_votes', 'summary', "The leader's votes per decision.")
+        votes.add(metrics.decision_votes, labels, '_sum')
+        votes.add(metrics.decisions, labels, '_count')
+        family('airbraille_characters_total', 'counter', 'Characters written.').add(metrics.characters, labels)
+        family('airbraille_error_utterances_total', 'counter', 'Patterns without text.').add(metrics.errors, labels)
+        family('airbraille_fps', 'gauge', 'Evaluated frames per second.').add(metrics.fps(now), labels)
+        if air_braille.time_to_first_frame is not None:
+            family('airbraille_time_to_first_frame_seconds', 'gauge', 'Seconds until the first classified frame.') \
+                .add(air_braille.time_to_first_frame, labels)
+        if air_braille.motion_gate is not None:
+            family('airbraille_motion_gate_skipped_total', 'counter', 'Frames, whose previous result was reused.') \
+                .add(air_braille.motion_gate.skipped, labels)
+        if air_braille.preview is not None:
+            family('airbraille_preview_replaced_total', 'counter', 'Preview states replaced before rendering.') \
+                .add(air_braille.preview.replaced, labels)
+
+        # the percentiles are calculated here, on the server's thread, not in the frame loop
+        stages = family('airbraille_stage_seconds', 'summary', 'Latency of the stages of the detection loop.')
+        for stage, histogram in list(air_braille.tracer.histograms.items()):
+            for quantile, value in zip(('0.5', '0.95', '0.99'), histogram.percentiles()):
+                stages.add(value / 1000.0, dict(labels, stage=stage, quantile=quantile))
+            stages.add(histogram.count, dict(labels, stage=stage), '_count')
+
+    lines = []
+    for metric in families.values():
+        lines.extend(metric.lines())
+    return '\n'.join(lines) + '\n'
+
+
+class MetricsServer(threading.Thread):
+    """
+    Serves the metrics over HTTP at /metrics, in the Prometheus text format, e.g. for a fleet monitor.
+    The metrics are collected, when they are requested.
+    """
+
+    def __init__(self, collect, port: int, host: str = '127.0.0.1'):
+        """
+        Inits the server, binds the port.
+        :param collect: returns the metrics as text, e.g. lambda: format_metrics({'main': air_braille})
+        :param port: the port, 0 for any free port
+        :param host: the address to listen on
+        """
+        super().__init__(name='MetricsServer', daemon=True)
+        self.collect = collect
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/', '/metrics'):
+                    self.send_error(404)
+                    return
+                body = server.collect().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass  # scraping is no news
+
+        self._server = HTTPServer((host, port), Handler)
+        self.port = self._server.server_address[1]
+
+    def run(self):
+        self._server.serve_forever(poll_interval=0.2)
+
+    def stop(self):
+        """
+        Stops serving, releases the port.
+        :return: void.
+        """
+        if self.is_alive():
+            self._server.shutdown()
+            self.join()
+        self._server.server_close()
@@ -0,0 +1,129 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+
+class StageHistogram(object):
+    """Rolling window of the latest durations of a stage."""
+
+    def __init__(self, window: int):
+        """
+        Inits the histogram.
+        :param window: the number of latest durations kept
+        """
+        self.durations = deque(maxlen=window)
+        self.count = 0
+
+    def add(self, duration: float):
+        """
+        Adds a duration.
+        :param duration: The duration in seconds.
+        :return: void.
+        """
+        self.durations.append(duration)
+        self.count += 1
+
+    def percentiles(self, percentiles=(50, 95, 99)) -> list:
+        """
+        Calculates percentiles of the kept durations.
+        :param percentiles: The percentiles to be calculated.
+        :return: The percentiles in milliseconds, zeros if nothing was recorded.
+        """
+        # copied at once, as the durations may be added to by another thread meanwhile
+        durations = tuple(self.durations)
+        if not durations:
+            return [0.0 for _ in percentiles]
+        return list(np.percentile(np.array(durations), percentiles) * 1000.0)
+
+
+class Tracer(object):
+    """
+    Records the time spans of the detection loop's stages into rolling histograms, and optionally
+    into a Chrome trace-event file (chrome://tracing, Perfetto). When disabled, now() returns 0.0
+    and span() returns at once, so the instrumentation costs next to nothing.
+    """
+
+    # the stage, that measures the latency from capturing a frame to emitting a character
+    END_TO_END: str = 'end_to_end'
+
+    def __init__(self, enabled: bool = False, window: int = 1000, trace_file: str = None,
+                 max_events: int = 1000000):
+        """
+        Inits the tracer.
+        :param enabled: whether anything is recorded
+        :param window: the number of latest spans kept per stage
+        :param trace_file: if set, the spans are exported to this file on export()
+        :param max_events: the maximum number of spans kept for the trace file
+        """
+        self.enabled = enabled
+        self.window = window
+        self.trace_file = trace_file
+        self.histograms = dict()
+        self._events = deque(maxlen=max_events) if trace_file else None
+        self._origin = time.perf_counter()
+
+    def now(self) -> float:
+        """
+        The current time, to be passed to span() later.
+        :return: time.perf_counter(), 0.0 if disabled.
+        """
+        if not self.enabled:
+            return 0.0
+        return time.perf_counter()
+
+    def span(self, stage: str, start: float, end: float = None) -> float:
+        """
+        Records the time span of a stage.
+        :param stage: The name of the stage.
+        :param start: The start, as returned by now() or a perf_counter timestamp.
+        :param end: The end, now if None.
+        :return: The end, so that the next stage can start there. 0.0 if disabled.
+        """
+        if not self.enabled:
+            return 0.0
+        if end is None:
+            end = time.perf_counter()
+
+        histogram = self.histograms.get(stage)
+        if histogram is None:
+            histogram = self.histograms.setdefault(stage, StageHistogram(self.window))
+        histogram.add(end - start)
+
+        if self._events is not None:
+            self._events.append((stage, start, end, threading.get_ident()))
+        return end
+
+    def report(self) -> str:
+        """
+        Creates a report of all stages.
+        :return: A table with the number of spans and the p50, p95, p99 in milliseconds per stage.
+        """
+        lines = [f'{"stage":16} {"count":>8} {"p50 ms":>9} {"p95 ms":>9} {"p99 ms":>9}']
+        for stage, histogram in self.histograms.items():
+            p50, p95, p99 = histogram.percentiles()
+            lines.append(f'{stage:16} {histogram.count:8} {p50:9.3f} {p95:9.3f} {p99:9.3f}')
+        return '\n'.join(lines)
+
+    def export(self):
+        """
+        Writes the recorded spans as Chrome trace-event JSON into the trace file.
+        :return: void.
+        """
+        if self._events is None:
+            return
+
+        pid = os.getpid()
+        events = [{
+            'name': stage,
+            'ph': 'X',
+            'ts': (start - self._origin) * 1e6,
+            'dur': (end - start) * 1e6,
+            'pid': pid,
+            'tid': tid
+        } for stage, start, end, tid in list(self._events)]
+        with open(self.trace_file, 'w') as trace_file:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, trace_file)
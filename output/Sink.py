@@ -0,0 +1,228 @@
+import socket
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+
+from helpers.Lazy import *
+from settings.Settings import *
+
+keyboard = lazy_import('keyboard')
+
+
+class AbstractOutputBackend(ABC):
+    """Base class for the backends, that finally output the text."""
+
+    @abstractmethod
+    def emit(self, text: str):
+        """
+        Outputs the text, may take its time, as it runs on the sink's thread.
+        :param text: The text, one or more characters.
+        :return: void.
+        """
+        pass
+
+    def close(self):
+        """
+        Releases the backend.
+        :return: void.
+        """
+        pass
+
+
+class PrintBackend(AbstractOutputBackend):
+    """Prints the text, as AirBraille did before keystrokes were sent."""
+
+    def emit(self, text: str):
+        print('printing ' + text)
+
+
+class KeyboardBackend(AbstractOutputBackend):
+    """Sends the text as keystrokes to the focused application."""
+
+    def emit(self, text: str):
+        keyboard.write(text)
+
+
+class FileBackend(AbstractOutputBackend):
+    """Appends the text to a file, e.g. to test the output without a keyboard."""
+
+    def __init__(self, file_path: str):
+        """
+        Inits the backend, opens the file.
+        :param file_path: the path of the file, '-' for stdout
+        """
+        self._file = sys.stdout if file_path == '-' else open(file_path, 'a', encoding='utf-8')
+
+    def emit(self, text: str):
+        self._file.write(text)
+        self._file.flush()
+
+    def close(self):
+        if self._file is not sys.stdout:
+            self._file.close()
+
+
+class SocketBackend(AbstractOutputBackend):
+    """Sends the text utf-8 encoded over TCP, e.g. to a test harness or another machine."""
+
+    def __init__(self, host: str, port: int):
+        """
+        Inits the backend, connects to the receiver.
+        :param host: the receiver's host
+        :param port: the receiver's port
+        """
+        self._socket = socket.create_connection((host, port))
+
+    def emit(self, text: str):
+        self._socket.sendall(text.encode('utf-8'))
+
+    def close(self):
+        self._socket.close()
+
+
+class OutputSink(threading.Thread):
+    """
+    Takes the text of the write handlers and outputs it on its own thread, so that the detection never
+    waits for the backend. Consecutive characters, that queue up meanwhile, are output as one batch.
+    Flush policies:
+        IMMEDIATE: the text is output as soon as possible.
+        WORD: the text is output up to the end of the last complete word, i.e. the last whitespace.
+        TIMED: the text is output, once its oldest character waited flush_after seconds.
+    With WORD, flush_after also bounds the waiting time of an incomplete word (None waits for the word's end).
+    """
+
+    # flush policies
+    IMMEDIATE: str = 'immediate'
+    WORD: str = 'word'
+    TIMED: str = 'timed'
+
+    def __init__(self, backend: AbstractOutputBackend, policy: str = IMMEDIATE, flush_after: float = 0.5):
+        """
+        Inits the output sink.
+        :param backend: outputs the text
+        :param policy: the flush policy, see above
+        :param flush_after: the seconds, after which pending text is output (TIMED, WORD)
+        """
+        super().__init__(name='OutputSink', daemon=True)
+        if policy not in (self.IMMEDIATE, self.WORD, self.TIMED):
+            raise ValueError(f'unknown flush policy: {policy}')
+        self.backend = backend
+        self.policy = policy
+        self.flush_after = flush_after
+        self.characters = 0  # characters output
+        self.batches = 0  # calls of the backend
+
+        self._pending = []
+        self._since = None  # the time.perf_counter() value, the oldest pending text was put
+        self._flush = False
+        self._stopped = False
+        self._condition = threading.Condition()
+
+    def put(self, text: str):
+        """
+        Queues the text to be output, returns immediately.
+        :param text: The text.
+        :return: void.
+        """
+        if not text:
+            return
+        with self._condition:
+            if not self._pending:
+                self._since = time.perf_counter()
+            self._pending.append(text)
+            self._condition.notify()
+
+    def flush(self):
+        """
+        Outputs all pending text, regardless of the policy, e.g. at the end of the input.
+        :return: void.
+        """
+        with self._condition:
+            self._flush = True
+            self._condition.notify()
+
+    def stop(self):
+        """
+        Outputs the pending text, stops the sink and closes the backend.
+        :return: void.
+        """
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        if self.is_alive():
+            self.join()
+        else:
+            self.backend.close()
+
+    def _take(self):
+        """
+        Takes the text, that is due according to the policy. The caller holds the lock.
+        :return: Tuple[the text, '' if none, the seconds until pending text is due, None if unknown].
+        """
+        if not self._pending:
+            self._flush = False
+            return '', None
+        text = ''.join(self._pending)
+        remaining = ''
+        wait = None
+        if not self._flush and not self._stopped and self.policy != self.IMMEDIATE:
+            waited = time.perf_counter() - self._since
+            if self.flush_after is None or waited < self.flush_after:
+                wait = None if self.flush_after is None else self.flush_after - waited
+                if self.policy == self.TIMED:
+                    return '', wait
+                end = max(text.rfind(' '), text.rfind('\n'), text.rfind('\t')) + 1
+                text, remaining = text[:end], text[end:]
+        self._pending = [remaining] if remaining else []
+        if not remaining:
+            self._flush = False
+        elif text:
+            self._since = time.perf_counter()
+        return text, wait
+
+    def run(self):
+        """
+        Outputs the text until stopped.
+        :return: void.
+        """
+        try:
+            while True:
+                with self._condition:
+                    text, wait = self._take()
+                    while not text and not self._stopped:
+                        self._condition.wait(wait)
+                        text, wait = self._take()
+                    stopped = self._stopped and not self._pending
+                if text:
+                    self.backend.emit(text)
+                    self.characters += len(text)
+                    self.batches += 1
+                if stopped:
+                    break
+        finally:
+            self.backend.close()
+
+
+def create_output_sink(settings=Settings) -> OutputSink:
+    """
+    Creates and starts the output sink, that the settings describe.
+    :param settings: The settings, see Settings.OUTPUT.
+    :return: The started output sink.
+    """
+    kind, _, target = settings.OUTPUT.partition(':')
+    if kind == 'print':
+        backend = PrintBackend()
+    elif kind == 'keyboard':
+        backend = KeyboardBackend()
+    elif kind == 'file':
+        backend = FileBackend(target or '-')
+    elif kind == 'socket':
+        host, _, port = target.rpartition(':')
+        backend = SocketBackend(host or 'localhost', int(port))
+    else:
+        raise ValueError(f'unknown output: {settings.OUTPUT}')
+
+    sink = OutputSink(backend, settings.OUTPUT_POLICY, settings.OUTPUT_FLUSH_AFTER)
+    sink.start()
+    return sink
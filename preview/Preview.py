@@ -0,0 +1,162 @@
+import threading
+import time
+
+import numpy as np
+
+from hand.Detection import *
+from helpers.Lazy import *
+from helpers.Pattern import *
+
+cv2 = lazy_import('cv2')
+mp = lazy_import('mediapipe')
+
+
+class PreviewState(object):
+    """Everything the preview shows of one frame. Created by the detection, only read by the renderer."""
+
+    def __init__(self, image: np.ndarray, hands: DetectedHands, roi=None, pattern: int = None, written=None,
+                 votes: int = 0, window: int = 0, hands_visible: bool = False):
+        """
+        Inits the state of the preview.
+        :param image: the camera frame (BGR, not mirrored), must not be changed afterwards
+        :param hands: the hands detected in the frame, in full frame coordinates of the mirrored frame
+        :param roi: the region of interest inference was restricted to, optional
+        :param pattern: the braille pattern of the frame, None if there was no valid hand pair
+        :param written: Tuple[the pattern, the text] that was written last, None if nothing yet
+        :param votes: the votes of the leading pattern
+        :param window: the number of votes, that are needed to write
+        :param hands_visible: the hand state, as announced to the user
+        """
+        self.image = image
+        self.hands = hands
+        self.roi = roi
+        self.pattern = pattern
+        self.written = written
+        self.votes = votes
+        self.window = window
+        self.hands_visible = hands_visible
+
+
+class PreviewRenderer(threading.Thread):
+    """
+    Renders the preview on its own thread, at most max_fps times a second, so that the preview never slows down
+    the recognition. The detection posts the latest state into a single-slot mailbox, that is never waited on:
+    a state, that was not rendered yet, is replaced by the newer one.
+    """
+
+    ESCAPE: int = 27
+
+    def __init__(self, title: str, max_fps: float = 15.0, on_escape=None):
+        """
+        Inits the renderer.
+        :param title: the title of the preview's window
+        :param max_fps: the maximum number of frames rendered per second
+        :param on_escape: called, when ESC is pressed in the preview, optional
+        """
+        super().__init__(name='PreviewRenderer', daemon=True)
+        self.title = title
+        self.max_fps = max_fps
+        self.on_escape = on_escape
+        self.rendered = 0  # frames rendered
+        self.replaced = 0  # states replaced before they were rendered
+        self._image = None  # the image drawn on, reused for every frame
+
+        self._state = None
+        self._lock = threading.Lock()
+        self._posted = threading.Event()
+        self._stopped = threading.Event()
+
+    def post(self, state: PreviewState):
+        """
+        Puts the state into the mailbox, returns immediately.
+        :param state: The latest state.
+        :return: void.
+        """
+        with self._lock:
+            if self._state is not None:
+                self.replaced += 1
+            self._state = state
+        self._posted.set()
+
+    def stop(self):
+        """
+        Stops rendering, closes the window.
+        :return: void.
+        """
+        self._stopped.set()
+        self._posted.set()
+        if self.is_alive() and threading.current_thread() is not self:
+            self.join()
+
+    def _take(self):
+        """
+        Takes the state out of the mailbox.
+        :return: The latest state, None if there is none.
+        """
+        with self._lock:
+            state, self._state = self._state, None
+            self._posted.clear()
+        return state
+
+    def run(self):
+        """
+        Renders the posted states until stopped.
+        :return: void.
+        """
+        interval = 1.0 / self.max_fps if self.max_fps else 0.0
+        next_due = 0.0
+        try:
+            while not self._stopped.is_set():
+                # keep the window responsive, even if no state is posted
+                if not self._posted.wait(0.05):
+                    cv2.waitKey(1)
+                    continue
+                delay = next_due - time.perf_counter()
+                if delay > 0:
+                    self._stopped.wait(delay)
+                    continue
+                state = self._take()
+                if state is None:
+                    continue
+                next_due = time.perf_counter() + interval
+
+                if self._image is None or self._image.shape != state.image.shape:
+                    self._image = np.empty_like(state.image)
+                cv2.imshow(self.title, self.render(state, self._image))
+                self.rendered += 1
+                if cv2.waitKey(1) & 0xFF == self.ESCAPE and self.on_escape is not None:
+                    self.on_escape()
+        finally:
+            cv2.destroyWindow(self.title)
+
+    @staticmethod
+    def render(state: PreviewState, image: np.ndarray = None) -> np.ndarray:
+        """
+        Draws the hands and the overlays on the mirrored frame (selfie view).
+        :param state: The state to be shown.
+        :param image: The image to draw on, shaped like the frame, allocated if None.
+        :return: The image to be shown (BGR).
+        """
+        image = cv2.flip(state.image, 1, dst=image)
+        height, width = image.shape[:2]
+        for landmarks in state.hands.landmarks:
+            points = [(int(x * width), int(y * height)) for x, y in landmarks[:, :2]]
+            for start, end in mp.solutions.hands.HAND_CONNECTIONS:
+                cv2.line(image, points[start], points[end], (255, 255, 255), 2)
+            for point in points:
+                cv2.circle(image, point, 3, (0, 0, 255), -1)
+        if state.roi is not None:
+            roi = state.roi
+            cv2.rectangle(image, (roi.x, roi.y), (roi.x + roi.width, roi.y + roi.height), (0, 255, 0), 1)
+
+        lines = [
+            f'hands: {"OK" if state.hands_visible else "NO"}',
+            f'pattern: {"-" if state.pattern is None else pattern_to_string(state.pattern)}',
+            f'votes: {state.votes}/{state.window}',
+        ]
+        if state.written is not None:
+            pattern, text = state.written
+            lines.append(f'written: {pattern_to_string(pattern)} {text!r}')
+        for i, line in enumerate(lines):
+            cv2.putText(image, line, (10, 25 + 25 * i), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
+        return image
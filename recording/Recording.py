@@ -0,0 +1,178 @@
+import os
+import time
+
+import numpy as np
+
+from hand.Detection import *
+
+
+# one record per frame: the capture timestamp and up to two decoded hands
+RECORD_DTYPE = np.dtype([
+    ('timestamp', '<f8'),
+    ('hands', 'u1'),  # number of detected hands
+    ('labels', 'u1', (2,)),  # index into LABELS
+    ('scores', '<f4', (2,)),
+    ('landmarks', '<f4', (2, 21, 3)),
+])
+
+LABELS = (DetectedHands.LEFT, DetectedHands.RIGHT)
+
+# the .npy header is written with a fixed size, so that it can be updated in place
+_MAGIC = b'\x93NUMPY\x01\x00'
+_HEADER_SIZE = 256
+
+
+def _header(count: int) -> bytes:
+    """
+    Creates the .npy (version 1.0) header for a recording of count frames.
+    :param count: The number of frames.
+    :return: The header, exactly _HEADER_SIZE bytes long.
+    """
+    header = "{'descr': %r, 'fortran_order': False, 'shape': (%d,), }" % (
+        np.lib.format.dtype_to_descr(RECORD_DTYPE), count)
+    header_len = _HEADER_SIZE - len(_MAGIC) - 2
+    return _MAGIC + header_len.to_bytes(2, 'little') + header.ljust(header_len - 1).encode('latin1') + b'\n'
+
+
+class LandmarkRecorder(object):
+    """
+    Appends the decoded hands of every frame to a .npy file, that can be loaded with
+    np.load(path, mmap_mode='r'). An existing recording is continued.
+    """
+
+    def __init__(self, file_path: str, flush_every: int = 300):
+        """
+        Inits the recorder, opens the file.
+        :param file_path: The path of the recording.
+        :param flush_every: The number of frames, after which the header is updated.
+        """
+        self.file_path = file_path
+        self.flush_every = flush_every
+        self.count = 0
+        self._record = np.zeros(1, dtype=RECORD_DTYPE)
+
+        if os.path.exists(file_path) and os.path.getsize(file_path) > 0:
+            self.count = LandmarkRecording(file_path).count
+            self._file = open(file_path, 'r+b')
+            self._file.seek(_HEADER_SIZE + self.count * RECORD_DTYPE.itemsize)
+            self._file.truncate()
+        else:
+            self._file = open(file_path, 'wb')
+            self._file.write(_header(0))
+
+    def write(self, timestamp: float, hands: DetectedHands):
+        """
+        Appends one frame.
+        :param timestamp: The capture timestamp of the frame.
+        :param hands: The decoded hands of the frame.
+        :return: void.
+        """
+        record = self._record[0]
+        count = min(len(hands), 2)
+        record['timestamp'] = timestamp
+        record['hands'] = count
+        record['labels'] = 0
+        record['scores'] = 0.0
+        record['landmarks'] = 0.0
+        for i in range(count):
+            record['labels'][i] = LABELS.index(hands.labels[i])
+            record['scores'][i] = hands.scores[i]
+            record['landmarks'][i] = hands.landmarks[i]
+
+        self._file.write(self._record.tobytes())
+        self.count += 1
+        if self.count % self.flush_every == 0:
+            self.flush()
+
+    def flush(self):
+        """
+        Writes the number of frames into the header.
+        :return: void.
+        """
+        self._file.seek(0)
+        self._file.write(_header(self.count))
+        self._file.seek(0, os.SEEK_END)
+        self._file.flush()
+
+    def close(self):
+        """
+        Flushes and closes the recording.
+        :return: void.
+        """
+        self.flush()
+        self._file.close()
+
+
+class LandmarkRecording(object):
+    """A recording of decoded hands, memory-mapped."""
+
+    def __init__(self, file_path: str):
+        """
+        Opens the recording. The frames are counted by the file's size, so that a recording,
+        that was not closed properly, can be read as well.
+        :param file_path: The path of the recording.
+        """
+        self.file_path = file_path
+        with open(file_path, 'rb') as recording_file:
+            version = np.lib.format.read_magic(recording_file)
+            if version != (1, 0):
+                raise ValueError(f'{file_path} is not a landmark recording')
+            _, _, dtype = np.lib.format.read_array_header_1_0(recording_file)
+            if dtype != RECORD_DTYPE or recording_file.tell() != _HEADER_SIZE:
+                raise ValueError(f'{file_path} is not a landmark recording')
+
+        self.count = (os.path.getsize(file_path) - _HEADER_SIZE) // RECORD_DTYPE.itemsize
+        if self.count > 0:
+            self.records = np.memmap(file_path, dtype=RECORD_DTYPE, mode='r', offset=_HEADER_SIZE,
+                                     shape=(self.count,))
+        else:
+            self.records = np.zeros(0, dtype=RECORD_DTYPE)
+
+    def __len__(self):
+        return self.count
+
+    def hands(self, index: int) -> DetectedHands:
+        """
+        Decodes the hands of one frame.
+        :param index: The index of the frame.
+        :return: The detected hands of the frame.
+        """
+        record = self.records[index]
+        count = int(record['hands'])
+        return DetectedHands(
+            [LABELS[label] for label in record['labels'][:count]],
+            [float(score) for score in record['scores'][:count]],
+            list(range(count)),
+            np.array(record['landmarks'][:count], dtype=np.float64)
+        )
+
+    def __iter__(self):
+        """
+        Iterates over all frames.
+        :return: Tuples of the capture timestamp and the detected hands.
+        """
+        for index in range(self.count):
+            yield float(self.records[index]['timestamp']), self.hands(index)
+
+
+def replay(file_path: str, air_braille, realtime: bool = False) -> float:
+    """
+    Feeds a recording through the classification of AirBraille, without any camera.
+    :param file_path: The path of the recording.
+    :param air_braille: The AirBraille instance, whose hand pairs, voting and write handler are used.
+    :param realtime: If True, the frames are fed at the recorded speed, as fast as possible otherwise.
+    :return: The seconds the replay took.
+    """
+    recording = LandmarkRecording(file_path)
+    start = time.perf_counter()
+    first_timestamp = None
+    for timestamp, hands in recording:
+        if realtime:
+            if first_timestamp is None:
+                first_timestamp = timestamp
+            delay = (timestamp - first_timestamp) - (time.perf_counter() - start)
+            if delay > 0:
+                time.sleep(delay)
+        air_braille.process_hands(hands, timestamp)
+
+    return time.perf_counter() - start
@@ -0,0 +1,309 @@
+import queue
+import threading
+import time
+
+from AirBraille import *
+from WriteHandler import *
+from settings.Settings import *
+from speech.Speech import *
+
+
+class Session(object):
+    """
+    One user at one station: its own source, settings, hand state, voter and write handler.
+    The frames are evaluated by the host's inference pool, at most one frame of a session at a time,
+    so the session's state is never touched by two threads at once.
+    """
+
+    def __init__(self, session_id: str, write_handler: AbstractWriteHandler, settings=Settings, speech=None,
+                 max_fps: float = None):
+        """
+        Inits a session.
+        :param session_id: the name of the session, e.g. the station
+        :param write_handler: the write handler, that the session writes with
+        :param settings: the session's settings, e.g. Settings.derive(CAMERA=1); CAMERA may be a video path
+        :param speech: the audio feedback, SilentSpeech if None (the speech engine exists once per process)
+        :param max_fps: the maximum number of frames per second, that are evaluated, unlimited if None
+        """
+        self.id = session_id
+        self.settings = settings
+        self.air_braille = AirBraille(write_handler, speech=speech if speech is not None else SilentSpeech(),
+                                      settings=settings)
+        self.max_fps = max_fps
+        self.frames_evaluated = 0
+        self.in_flight = False  # a frame of the session is being evaluated
+        self.error = None  # the exception, that stopped the session
+        self.detector_settings = detector_settings(settings)  # tells, which of the pool's detections fit
+        self.own_detector = None  # Tuple[key, hand detection], if the session's backend cannot be shared
+        self._next_due = 0.0
+
+    @property
+    def capture(self) -> CameraCapture:
+        return self.air_braille.capture
+
+    def start(self):
+        """
+        Starts capturing the session's source.
+        :return: void.
+        """
+        self.air_braille.open_recorder()
+        self.capture.start()
+
+    def stop(self):
+        """
+        Stops capturing, closes the recording.
+        :return: void.
+        """
+        self.capture.stop()
+        self.air_braille.close()
+
+    def is_finished(self) -> bool:
+        """
+        Determines whether the session's source has ended and its last frame was evaluated.
+        :return: True, if finished, False otherwise.
+        """
+        return (self.error is not None or self.capture.buffer.closed) and not self.in_flight
+
+    def next_frame(self, now: float):
+        """
+        Takes the session's newest frame, if the frame rate cap allows for one.
+        :param now: The current time.perf_counter() value.
+        :return: The newest frame, None if there is none or it is too early.
+        """
+        if self.in_flight or self.error is not None or now < self._next_due:
+            return None
+        frame = self.capture.buffer.poll()
+        if frame is not None and self.max_fps:
+            self._next_due = max(self._next_due + 1.0 / self.max_fps, now)
+        return frame
+
+    @property
+    def detector(self) -> str:
+        return self.air_braille.detector
+
+    def switch_detector(self, name: str):
+        """
+        Switches the session's hand detection backend, starting with its next frame.
+        :param name: The name of the backend, see Settings.DETECTOR.
+        :return: void.
+        """
+        self.air_braille.switch_detector(name)
+
+    def close_detector(self):
+        """
+        Releases the session's own hand detection.
+        :return: void.
+        """
+        if self.own_detector is not None:
+            self.own_detector[1].close()
+            self.own_detector = None
+
+    def evaluate(self, frame: Frame, detector: AbstractHandDetector):
+        """
+        Evaluates a frame of the session.
+        :param frame: The captured frame.
+        :param detector: The hand detection of the inference worker.
+        :return: void.
+        """
+        self.air_braille.evaluate_frame(frame, detector)
+        self.frames_evaluated += 1
+
+    def fail(self, error: Exception):
+        """
+        Stops the session after its frame could not be evaluated, the other sessions go on.
+        :param error: The exception raised while evaluating the frame.
+        :return: void.
+        """
+        self.error = error
+        self.capture.stop()
+        print(f'session {self.id} stopped: {error!r}')
+
+
+class InferencePool(object):
+    """
+    A bounded number of inference workers, each owning one hand detection per backend and detector settings,
+    that is shared by all sessions using them. As consecutive frames of a worker come from different sessions,
+    the detection runs in static image mode, i.e. without tracking the hands from frame to frame. Detections,
+    that keep state across frames (e.g. scripted ones), cannot be shared and belong to their session instead.
+    """
+
+    def __init__(self, workers: int = 2):
+        """
+        Inits the inference pool.
+        :param workers: the number of worker threads
+        """
+        self.workers = workers
+        self._tasks = queue.Queue(maxsize=workers)
+        self._threads = [threading.Thread(target=self._run, name=f'InferenceWorker-{i}', daemon=True)
+                         for i in range(workers)]
+
+    def start(self):
+        """
+        Starts the workers.
+        :return: void.
+        """
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, session: Session, frame: Frame):
+        """
+        Passes a session's frame on to the next free worker. Blocks, while all workers are busy.
+        :param session: The session.
+        :param frame: The session's frame.
+        :return: void.
+        """
+        session.in_flight = True
+        self._tasks.put((session, frame))
+
+    def stop(self):
+        """
+        Stops the workers, after the submitted frames were evaluated.
+        :return: void.
+        """
+        for _ in self._threads:
+            self._tasks.put(None)
+        for thread in self._threads:
+            thread.join()
+
+    def _run(self):
+        """
+        Evaluates submitted frames until stopped.
+        :return: void.
+        """
+        detectors = dict()  # the worker's shared hand detections by backend and detector settings
+        try:
+            while True:
+                task = self._tasks.get()
+                if task is None:
+                    break
+                session, frame = task
+                try:
+                    session.evaluate(frame, self._detector(detectors, session))
+                except Exception as error:
+                    # the worker serves the other sessions as well, so only the failing one is stopped
+                    session.fail(error)
+                finally:
+                    session.in_flight = False
+        finally:
+            for detector in detectors.values():
+                detector.close()
+
+    @staticmethod
+    def _detector(detectors: dict, session: Session) -> AbstractHandDetector:
+        """
+        Finds the hand detection for a session's frame, builds it if there is none yet.
+        :param detectors: The worker's shared hand detections.
+        :param session: The session.
+        :return: The hand detection.
+        """
+        key = (session.detector, session.detector_settings)
+        if session.own_detector is not None and session.own_detector[0] == key:
+            return session.own_detector[1]
+        detector = detectors.get(key)
+        if detector is None:
+            detector = AirBraille.create_detector(session.settings, session.detector, static_image_mode=True)
+            if not detector.SHAREABLE:
+                # the session evaluates one frame at a time, so its own detection is never used twice at once
+                session.close_detector()
+                session.own_detector = (key, detector)
+                return detector
+            detectors[key] = detector
+        return detector
+
+
+class SessionHost(object):
+    """
+    Runs several independent sessions in one process. The sessions share the inference pool, a dispatcher
+    hands their newest frames to it in round robin order, so that every session gets its turn, and skips
+    sessions, that still wait for a frame to be evaluated or reached their frame rate cap.
+    """
+
+    # seconds to wait, if no session had a new frame
+    IDLE_INTERVAL: float = 0.002
+
+    def __init__(self, workers: int = 2):
+        """
+        Inits the session host.
+        :param workers: the number of inference workers
+        """
+        self.pool = InferencePool(workers)
+        self.sessions = []
+        self._next = 0  # the session, that is served first in the next round
+        self._stop_event = threading.Event()
+        self._running = False
+
+    def add(self, session: Session) -> Session:
+        """
+        Adds a session. Sessions added while running are started right away.
+        :param session: The session.
+        :return: The session.
+        """
+        self.sessions.append(session)
+        if self._running:
+            session.start()
+        return session
+
+    def run(self):
+        """
+        Starts all sessions and dispatches their frames, until all sources have ended or the host is stopped.
+        :return: void.
+        """
+        self.pool.start()
+        for session in list(self.sessions):
+            session.start()
+        self._running = True
+        metrics_server = None
+        if Settings.METRICS_PORT is not None:
+            metrics_server = MetricsServer(self.format_metrics, Settings.METRICS_PORT, Settings.METRICS_HOST)
+            metrics_server.start()
+        try:
+            while not self._stop_event.is_set():
+                sessions = [session for session in self.sessions if not session.is_finished()]
+                if not sessions:
+                    break
+                if not self._dispatch(sessions):
+                    time.sleep(self.IDLE_INTERVAL)
+        finally:
+            self._running = False
+            for session in self.sessions:
+                session.capture.stop()
+            self.pool.stop()
+            for session in self.sessions:
+                session.close_detector()
+                session.air_braille.close()
+            if metrics_server is not None:
+                metrics_server.stop()
+
+    def format_metrics(self) -> str:
+        """
+        Collects the metrics of all sessions, labeled with their names.
+        :return: The metrics in the Prometheus text format.
+        """
+        return format_metrics({session.id: session.air_braille for session in list(self.sessions)})
+
+    def _dispatch(self, sessions: list) -> bool:
+        """
+        Submits the newest frame of every session, that may be evaluated, starting after the last session served.
+        :param sessions: The running sessions.
+        :return: True, if a frame was submitted, False otherwise.
+        """
+        submitted = False
+        now = time.perf_counter()
+        count = len(sessions)
+        start = self._next % count
+        for i in range(count):
+            session = sessions[(start + i) % count]
+            frame = session.next_frame(now)
+            if frame is None:
+                continue
+            self.pool.submit(session, frame)
+            self._next = (start + i + 1) % count
+            submitted = True
+        return submitted
+
+    def stop(self):
+        """
+        Stops the host, may be called from any thread.
+        :return: void.
+        """
+        self._stop_event.set()
@@ -7,13 +7,75 @@ class Settings(object):
     PRINT_FINGER: bool = False
     PRINT_ANGLE: bool = False
 
+    # latency tracing
+    TRACE: bool = False  # record the time spent in each stage of the detection loop
+    TRACE_WINDOW: int = 1000  # number of latest spans per stage, the percentiles are calculated on
+    TRACE_FILE: str = None  # if set, the spans are exported as Chrome trace-event JSON
+
+    # metrics
+    METRICS_PORT: int = None  # if set, the metrics and stage latencies are served at http://METRICS_HOST:PORT/metrics
+    METRICS_HOST: str = '127.0.0.1'  # the address, the metrics are served on
+
+    # preview
+    PREVIEW_FPS: float = 15.0  # the preview (show_gui or DEBUG) is rendered at most this often
+
     # modes:
+    HEADLESS: bool = False  # no preview, no drawing and no debug evaluation, stopped by SIGINT/SIGTERM
     CONFIRM_INPUT: bool = True
     INVERT: bool = False
 
+    # camera input
+    CAMERA: int = 0  # the index of the camera
+    FRAME_BUFFER_SIZE: int = 2  # number of newest frames kept, older ones are dropped
+    MIRROR_LANDMARKS: bool = False  # do not mirror the frames, but the landmarks after inference
+    RECORD_FILE: str = None  # if set, the landmarks of every frame are recorded to this file
+    ROI: bool = False  # only pass the region around the last detected hands on to inference
+    ROI_MARGIN: float = 0.25  # margin around the hands, relative to their bounding box' size
+    ROI_MAX_SIZE: int = 640  # longest side in pixels of the image passed to inference
+    MOTION_GATE: bool = False  # reuse the previous result, while the hands do not move
+    MOTION_THRESHOLD: float = 2.0  # mean gray level difference, below which the hands did not move
+    MOTION_FORCE_EVERY: int = 10  # inference is forced at least every n frames
+
+    # hand detection
+    DETECTOR: str = 'mediapipe'  # the backend: 'mediapipe', 'mediapipe-lite', 'scripted' or a registered one
+    DETECTOR_MAX_HANDS: int = 2  # maximum number of hands, that are detected
+    DETECTOR_MODEL_COMPLEXITY: int = None  # 0 (lite) or 1 (full), None for MediaPipe's default
+    DETECTOR_MIN_DETECTION_CONFIDENCE: float = 0.5  # minimum confidence, at which a hand is detected
+    DETECTOR_MIN_TRACKING_CONFIDENCE: float = 0.5  # minimum confidence, at which a hand is still tracked
+    DETECTOR_SCRIPT: str = None  # 'scripted': a landmark recording, or braille patterns like '145 145 - 1'
+
+    # audio feedback
+    SPEECH_INTERRUPT_STALE: bool = True  # cut off or skip feedback, that is outdated
+    SPEECH_STALE_AFTER: float = 2.0  # seconds, after which queued feedback is outdated
+    SPEECH_COALESCE_STATE: bool = True  # only speak the latest hand(s) visibility notice
+    SPEECH_MAX_PENDING: int = 2  # number of pending characters, before the queued ones are dropped
+    SPEECH_CACHE: bool = False  # play pre-synthesized audio of all characters and messages (needs simpleaudio)
+    SPEECH_CACHE_DIR: str = '__speechcache__'  # the directory, the synthesized audio is kept in
+
+    # text output
+    OUTPUT: str = 'print'  # 'print', 'keyboard', 'file:<path>' or 'socket:<host>:<port>'
+    OUTPUT_POLICY: str = 'immediate'  # when the text is output: 'immediate', 'word' or 'timed'
+    OUTPUT_FLUSH_AFTER: float = 0.5  # seconds, after which pending text is output ('word', 'timed')
+
+    # input confirmation with early decisions
+    VOTE_SEQUENTIAL: bool = False  # decide a take as soon as its leader is settled, at most after THRESHOLD frames
+    VOTE_CONFIDENCE: float = 3.0  # weighted votes, by which the leader has to lead the runner-up
+    VOTE_MIN_FRAMES: int = 3  # number of frames, before which a take is never decided
+    VOTE_ANGLE_MARGIN: float = 20.0  # degrees from ANGLE, at which a finger counts as certain
+
+    # landmark smoothing (One Euro filter)
+    SMOOTHING: bool = False  # smooth the landmarks over time before they are evaluated
+    SMOOTHING_MIN_CUTOFF: float = 1.5  # cutoff frequency in Hz of a hand held still, lower is smoother
+    SMOOTHING_BETA: float = 5.0  # how fast the cutoff rises with speed, higher lags less behind movements
+    SMOOTHING_D_CUTOFF: float = 1.0  # cutoff frequency in Hz of the landmarks' speed
+
     THRESHOLD: int = 10  # number of images, that are collected in one take
     ANGLE: int = 120  # the angle, at which the finger is stretched or not
 
+    # continuous input
+    VOTE_WINDOW: int = 11  # number of latest images, that are voted on
+    VOTE_MARGIN: int = 0  # votes, by which the leader has to outnumber the runner-up, 0 for a plurality
+
     # finger is braille point:
     #################
     #               #
@@ -37,3 +99,16 @@ class Settings(object):
     RIGHT_MIDDLE: int = 5
     RIGHT_RING: int = 6
     RIGHT_KINKY: int = 8
+
+    @classmethod
+    def derive(cls, **overrides):
+        """
+        Creates settings, that differ from these only in the given values, e.g. for one of several sessions.
+        The derived settings are a subclass, so all other values are still looked up here.
+        :param overrides: The differing values by name.
+        :return: The derived settings.
+        """
+        for name in overrides:
+            if not hasattr(cls, name):
+                raise AttributeError(f'unknown setting: {name}')
+        return type(cls.__name__, (cls,), overrides)
@@ -0,0 +1,215 @@
+import threading
+import time
+from collections import deque
+
+from helpers.Lazy import *
+from settings.Settings import *
+from speech.SpeechCache import *
+
+pyttsx3 = lazy_import('pyttsx3')
+
+
+class Utterance(object):
+
+    # kinds of utterances
+    MESSAGE: str = 'message'  # e.g. the start message, never dropped
+    CHARACTER: str = 'character'  # the feedback on a typed character
+    STATE: str = 'state'  # the hand(s) visibility notice
+
+    def __init__(self, text: str, kind: str):
+        """
+        Inits an utterance.
+        :param text: the text to be spoken
+        :param kind: the kind of the utterance, decides which policies apply
+        """
+        self.text = text
+        self.kind = kind
+        self.timestamp = time.perf_counter()
+
+
+class SpeechWorker(threading.Thread):
+    """
+    Speaks utterances on its own thread, so that the detection never waits for audio.
+    Policies (see Settings):
+        SPEECH_INTERRUPT_STALE: a character being spoken is cut off by a newer character,
+            queued characters and state notices older than SPEECH_STALE_AFTER seconds are skipped.
+        SPEECH_COALESCE_STATE: a new hand state notice replaces the pending ones.
+        SPEECH_MAX_PENDING: if more characters are pending, the user types faster than speech,
+            so the queued characters are dropped and only the newest one is kept.
+    """
+
+    # seconds to wait between two iterations of the speech engine
+    POLL_INTERVAL: float = 0.01
+
+    def __init__(self, settings=Settings, texts=()):
+        """
+        Inits the speech worker. The text to speech engine is created on the worker's thread.
+        :param settings: the settings, that define the policies
+        :param texts: the texts, whose audio is cached if Settings.SPEECH_CACHE is set (e.g. all characters)
+        """
+        super().__init__(name='SpeechWorker', daemon=True)
+        self.settings = settings
+        self.texts = texts
+        self.cache = None  # the cached audio, created on the worker's thread
+        self._queue = deque()
+        self._condition = threading.Condition()
+        self._stopped = False
+        self._speaking = False
+
+    def say(self, text: str, kind: str = Utterance.MESSAGE):
+        """
+        Queues the text to be spoken, returns immediately.
+        :param text: The text to be spoken.
+        :param kind: The kind of the utterance.
+        :return: void.
+        """
+        utterance = Utterance(text, kind)
+        with self._condition:
+            if kind == Utterance.STATE and self.settings.SPEECH_COALESCE_STATE:
+                self._remove(Utterance.STATE)
+            elif kind == Utterance.CHARACTER and self._count(Utterance.CHARACTER) >= self.settings.SPEECH_MAX_PENDING:
+                self._remove(Utterance.CHARACTER)
+            self._queue.append(utterance)
+            self._condition.notify()
+
+    def _count(self, kind: str) -> int:
+        """
+        Counts the queued utterances of a kind. The caller holds the lock.
+        :param kind: The kind of the utterances.
+        :return: The number of queued utterances of that kind.
+        """
+        return sum(1 for utterance in self._queue if utterance.kind == kind)
+
+    def _remove(self, kind: str):
+        """
+        Removes all queued utterances of a kind. The caller holds the lock.
+        :param kind: The kind of the utterances.
+        :return: void.
+        """
+        for utterance in [u for u in self._queue if u.kind == kind]:
+            self._queue.remove(utterance)
+
+    def _is_stale(self, utterance: Utterance) -> bool:
+        """
+        Tells, whether a queued utterance is too old to be spoken.
+        :param utterance: The utterance.
+        :return: True, if it should be skipped.
+        """
+        return self.settings.SPEECH_INTERRUPT_STALE and utterance.kind != Utterance.MESSAGE \
+            and time.perf_counter() - utterance.timestamp > self.settings.SPEECH_STALE_AFTER
+
+    def _next(self):
+        """
+        Waits for the next utterance, that is not stale.
+        :return: The utterance, None if the worker was stopped.
+        """
+        with self._condition:
+            while True:
+                while not self._queue and not self._stopped:
+                    self._condition.wait()
+                if self._stopped:
+                    return None
+                utterance = self._queue.popleft()
+                if not self._is_stale(utterance):
+                    return utterance
+
+    def _is_interrupted(self, utterance: Utterance) -> bool:
+        """
+        Tells, whether the utterance being spoken should be cut off.
+        :param utterance: The utterance being spoken.
+        :return: True, if a newer character is waiting or the worker was stopped.
+        """
+        with self._condition:
+            if self._stopped:
+                return True
+            return self.settings.SPEECH_INTERRUPT_STALE and utterance.kind == Utterance.CHARACTER \
+                and self._count(Utterance.CHARACTER) > 0
+
+    def _on_finished(self, name, completed):
+        """
+        Callback of the engine, when an utterance was spoken.
+        :return: void.
+        """
+        self._speaking = False
+
+    def run(self):
+        """
+        Speaks the queued utterances until stopped.
+        :return: void.
+        """
+        engine = pyttsx3.init()  # init text to speech
+        if self.settings.SPEECH_CACHE and SpeechCache.is_available():
+            # synthesizes the texts, that are not cached yet, only once
+            cache = SpeechCache(self.settings.SPEECH_CACHE_DIR, engine.getProperty('voice'), engine.getProperty('rate'))
+            cache.synthesize(engine, self.texts)
+            self.cache = cache
+        engine.connect('finished-utterance', self._on_finished)
+        # drive the engine ourselves, so that an utterance can be interrupted
+        engine.startLoop(False)
+        try:
+            while True:
+                utterance = self._next()
+                if utterance is None:
+                    break
+
+                clip = self.cache.get(utterance.text) if self.cache is not None else None
+                if clip is not None:
+                    self._play(clip, utterance)
+                    continue
+
+                # not cached, synthesize live
+                self._speaking = True
+                engine.say(utterance.text)
+                while self._speaking:
+                    engine.iterate()
+                    if self._is_interrupted(utterance):
+                        engine.stop()
+                        self._speaking = False
+                    else:
+                        time.sleep(self.POLL_INTERVAL)
+        finally:
+            engine.endLoop()
+
+    def _play(self, clip: Clip, utterance: Utterance):
+        """
+        Plays the cached audio of an utterance, until it is finished or interrupted.
+        :param clip: The audio.
+        :param utterance: The utterance.
+        :return: void.
+        """
+        playback = clip.play()
+        while playback.is_playing():
+            if self._is_interrupted(utterance):
+                playback.stop()
+                break
+            time.sleep(self.POLL_INTERVAL)
+
+    def stop(self):
+        """
+        Stops speaking, drops all queued utterances.
+        :return: void.
+        """
+        with self._condition:
+            self._stopped = True
+            self._queue.clear()
+            self._condition.notify_all()
+
+
+class SilentSpeech(object):
+    """Drops all utterances, e.g. for replays on machines without audio."""
+
+    def say(self, text: str, kind: str = Utterance.MESSAGE):
+        """
+        Drops the text.
+        :param text: The text to be spoken.
+        :param kind: The kind of the utterance.
+        :return: void.
+        """
+        pass
+
+    def stop(self):
+        """
+        Nothing to stop.
+        :return: void.
+        """
+        pass
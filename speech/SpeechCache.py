@@ -0,0 +1,112 @@
+import hashlib
+import os
+import wave
+
+try:
+    import simpleaudio
+except ImportError:
+    simpleaudio = None  # optional, without it every utterance is synthesized live
+
+
+class Clip(object):
+    """The audio of one text, held in memory, ready to be played."""
+
+    def __init__(self, data: bytes, channels: int, sample_width: int, sample_rate: int):
+        """
+        Inits a clip.
+        :param data: the pcm frames
+        :param channels: the number of channels
+        :param sample_width: the bytes per sample
+        :param sample_rate: the samples per second
+        """
+        self.data = data
+        self.channels = channels
+        self.sample_width = sample_width
+        self.sample_rate = sample_rate
+
+    def play(self):
+        """
+        Starts playing the clip, returns immediately.
+        :return: The playback, see simpleaudio.PlayObject (is_playing, stop).
+        """
+        return simpleaudio.play_buffer(self.data, self.channels, self.sample_width, self.sample_rate)
+
+
+class SpeechCache(object):
+    """
+    Audio of texts, synthesized once by the text to speech engine and kept on disk, keyed by the voice,
+    the rate and the text. At startup, the audio is loaded into memory, so that speaking a cached text is
+    only playing a buffer.
+    """
+
+    def __init__(self, directory: str, voice: str, rate: int):
+        """
+        Inits the cache.
+        :param directory: the directory, the audio files are kept in
+        :param voice: the engine's voice
+        :param rate: the engine's speech rate
+        """
+        self.directory = directory
+        self.voice = voice
+        self.rate = rate
+        self.clips = dict()  # the loaded clips by text
+
+    @staticmethod
+    def is_available() -> bool:
+        """
+        Tells, whether cached audio can be played (simpleaudio is installed).
+        :return: True, if available, False otherwise.
+        """
+        return simpleaudio is not None
+
+    def path(self, text: str) -> str:
+        """
+        The path of a text's audio file.
+        :param text: The text.
+        :return: The path.
+        """
+        key = hashlib.sha1(f'{self.voice}\0{self.rate}\0{text}'.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, f'{key}.wav')
+
+    def load(self, texts) -> list:
+        """
+        Loads the audio of the texts into memory.
+        :param texts: The texts.
+        :return: The texts, whose audio is not cached (or not readable).
+        """
+        missing = []
+        for text in texts:
+            if text in self.clips:
+                continue
+            try:
+                with wave.open(self.path(text), 'rb') as wav:
+                    self.clips[text] = Clip(wav.readframes(wav.getnframes()), wav.getnchannels(),
+                                            wav.getsampwidth(), wav.getframerate())
+            except (OSError, EOFError, wave.Error):
+                missing.append(text)
+        return missing
+
+    def synthesize(self, engine, texts):
+        """
+        Synthesizes the audio of the texts, that is not cached yet, and loads it. Must be called, before the
+        engine's loop is started.
+        :param engine: The text to speech engine (pyttsx3).
+        :param texts: The texts.
+        :return: void.
+        """
+        missing = self.load(texts)
+        if not missing:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        for text in missing:
+            engine.save_to_file(text, self.path(text))
+        engine.runAndWait()
+        self.load(missing)
+
+    def get(self, text: str):
+        """
+        The audio of a text.
+        :param text: The text.
+        :return: The clip, None if the text is not cached.
+        """
+        return self.clips.get(text)
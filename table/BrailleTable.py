@@ -0,0 +1,185 @@
+import hashlib
+import json
+import os
+import struct
+import sys
+from typing import List
+
+from helpers.Pattern import *
+
+# Compiled braille table:
+#   header: magic, dots, number of strings, source size, source mtime, source sha256
+#   entries: uint16[1 << POINTS], the index of every pattern's text into the strings
+#   offsets: uint32[number of strings + 1], the start of every string inside the data
+#   data: the utf-8 encoded strings
+_MAGIC = b'ABT1'
+_HEADER = struct.Struct('<4sHHqq32s')
+
+# the directory next to a braille file, its compiled tables are cached in
+CACHE_DIR: str = '__braillecache__'
+
+
+def _digest(source: bytes) -> bytes:
+    return hashlib.sha256(source).digest()
+
+
+def parse_cell(fingers: str, where: str) -> int:
+    """
+    Parses and validates the dots of one cell of a braille file.
+    :param fingers: The dots, e.g. '145', '0' for the empty cell.
+    :param where: The file and entry, for the error message.
+    :return: The cell's pattern.
+    """
+    # '0' denotes the empty cell, as point 0 is preserved for the left thumb
+    if fingers == '0':
+        fingers = ''
+    if any(point not in '12345678' for point in fingers) or len(set(fingers)) != len(fingers):
+        raise ValueError(f'{where} has illegal dots "{fingers}"')
+    return pattern_from_string(fingers)
+
+
+def parse_braille_file(file_path: str, source: bytes = None) -> dict:
+    """
+    Parses and validates a braille file.
+    :param file_path: The path to the braille file.
+    :param source: The file's content, read from file_path if None.
+    :return: The text by pattern.
+    """
+    if source is None:
+        with open(file_path, 'rb') as source_file:
+            source = source_file.read()
+
+    keys = dict()
+    for number, entry in enumerate(json.loads(source)):
+        fingers = entry.get('fingers')
+        text = entry.get('c')
+        if not isinstance(fingers, str) or not isinstance(text, str):
+            raise ValueError(f'{file_path}: entry {number} needs the strings "fingers" and "c"')
+        pattern = parse_cell(fingers, f'{file_path}: entry {number}')
+        if pattern in keys:
+            raise ValueError(f'{file_path}: entry {number} repeats the dots "{pattern_to_string(pattern)}"')
+        keys[pattern] = text
+
+    return keys
+
+
+def compile_braille_table(file_path: str, dots: int, source: bytes = None) -> bytes:
+    """
+    Compiles a braille file into a table, that holds the text for every pattern. Points that are
+    not part of the dots (e.g. the thumbs) do not change the text.
+    :param file_path: The path to the braille file.
+    :param dots: The dots that are looked up, e.g. DOTS_6.
+    :param source: The file's content, read from file_path if None.
+    :return: The compiled table.
+    """
+    if source is None:
+        with open(file_path, 'rb') as source_file:
+            source = source_file.read()
+    keys = parse_braille_file(file_path, source)
+
+    strings = ['']
+    indices = {'': 0}
+    entries = []
+    for pattern in range(1 << POINTS):
+        text = keys.get(pattern & dots, '')
+        if text not in indices:
+            indices[text] = len(strings)
+            strings.append(text)
+        entries.append(indices[text])
+
+    data = [string.encode('utf-8') for string in strings]
+    offsets = [0]
+    for encoded in data:
+        offsets.append(offsets[-1] + len(encoded))
+
+    stat = os.stat(file_path)
+    header = _HEADER.pack(_MAGIC, dots, len(strings), stat.st_size, stat.st_mtime_ns, _digest(source))
+    return header + struct.pack(f'<{len(entries)}H', *entries) + struct.pack(f'<{len(offsets)}I', *offsets) \
+        + b''.join(data)
+
+
+def read_braille_table(compiled: bytes) -> List[str]:
+    """
+    Reads a compiled table.
+    :param compiled: The compiled table.
+    :return: The text of every pattern (index is the pattern), '' if not known.
+    """
+    _, _, count, _, _, _ = _HEADER.unpack_from(compiled)
+    offset = _HEADER.size
+    entries = struct.unpack_from(f'<{1 << POINTS}H', compiled, offset)
+    offset += 2 << POINTS
+    offsets = struct.unpack_from(f'<{count + 1}I', compiled, offset)
+    offset += 4 * (count + 1)
+    data = compiled[offset:]
+    strings = [data[offsets[i]:offsets[i + 1]].decode('utf-8') for i in range(count)]
+    return [strings[index] for index in entries]
+
+
+def cache_path(file_path: str, dots: int) -> str:
+    """
+    The path of a braille file's compiled table.
+    :param file_path: The path to the braille file.
+    :param dots: The dots that are looked up.
+    :return: The path of the cached table.
+    """
+    directory, name = os.path.split(os.path.abspath(file_path))
+    return os.path.join(directory, CACHE_DIR, f'{os.path.splitext(name)[0]}.{dots:03x}.bin')
+
+
+def _cached(file_path: str, dots: int, compiled: bytes) -> bool:
+    """
+    Determines whether a cached table is still valid: the file's size and mtime are unchanged,
+    or else the file's content is.
+    :param file_path: The path to the braille file.
+    :param dots: The dots that are looked up.
+    :param compiled: The cached table.
+    :return: True, if valid, False otherwise.
+    """
+    if len(compiled) < _HEADER.size:
+        return False
+    magic, cached_dots, _, size, mtime, digest = _HEADER.unpack_from(compiled)
+    if magic != _MAGIC or cached_dots != dots:
+        return False
+    stat = os.stat(file_path)
+    if stat.st_size == size and stat.st_mtime_ns == mtime:
+        return True
+    with open(file_path, 'rb') as source_file:
+        return _digest(source_file.read()) == digest
+
+
+def load_braille_table(file_path: str, dots: int) -> List[str]:
+    """
+    Loads a braille file into a table, that holds the text for every pattern. The compiled table is
+    cached next to the braille file and compiled again, as soon as the file changes.
+    :param file_path: The path to the braille file.
+    :param dots: The dots that are looked up, e.g. DOTS_6.
+    :return: The text of every pattern (index is the pattern), '' if not known.
+    """
+    path = cache_path(file_path, dots)
+    try:
+        with open(path, 'rb') as cache_file:
+            compiled = cache_file.read()
+        if _cached(file_path, dots, compiled):
+            return read_braille_table(compiled)
+    except OSError:
+        pass
+
+    compiled = compile_braille_table(file_path, dots)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # written aside and renamed, so that a concurrent start never reads a partial table
+        temp_path = f'{path}.{os.getpid()}'
+        with open(temp_path, 'wb') as cache_file:
+            cache_file.write(compiled)
+        os.replace(temp_path, path)
+    except OSError:
+        pass  # read-only install, the table is compiled on every start
+    return read_braille_table(compiled)
+
+
+if __name__ == '__main__':
+    # compiles the given braille files for 6-dot and 8-dot braille, e.g. to check them or ship the cache
+    for braille_file in sys.argv[1:]:
+        for table_dots in (pattern_from_string('123456'), pattern_from_string('12345678')):
+            load_braille_table(braille_file, table_dots)
+        print(f'compiled {braille_file}')
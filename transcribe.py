@@ -0,0 +1,46 @@
+# This script transcribes recorded videos of typing sessions.
+
+import argparse
+import os
+import time
+
+from WriteHandler import *
+from helpers.Pattern import *
+from settings.Settings import *
+from transcription.Transcriber import *
+
+# sources
+six_dot_file = "braille_files/6_dot_AT.json"
+eight_dot_file = "braille_files/8_dot_AT.json"
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Transcribes recorded videos of AirBraille typing sessions.')
+    parser.add_argument('videos', metavar='VIDEO', nargs='+', help='the videos to be transcribed')
+    parser.add_argument('--workers', type=int, default=None, help='number of worker processes (default: all cores)')
+    parser.add_argument('--chunk', type=int, default=600, help='number of frames per task')
+    parser.add_argument('--eight-dot', action='store_true', help='use 8-dot instead of 6-dot braille')
+    args = parser.parse_args()
+
+    Settings.DEBUG = False
+    if args.eight_dot:
+        def write_handler():
+            return WriteHandler8Dot(eight_dot_file)
+    else:
+        def write_handler():
+            return WriteHandler6Dot(six_dot_file)
+
+    start = time.perf_counter()
+    transcripts = Transcriber(args.workers, args.chunk).transcribe(args.videos, write_handler)
+
+    for video, transcript in transcripts.items():
+        # the text and a log of every character with its time in the video
+        base = os.path.splitext(video)[0]
+        with open(base + '.txt', 'w', encoding='utf-8') as text_file:
+            text_file.write(transcript.text())
+        with open(base + '.tsv', 'w', encoding='utf-8') as log_file:
+            log_file.write('seconds\tdots\ttext\n')
+            for seconds, fingers, text in transcript.log:
+                log_file.write(f'{seconds:.3f}\t{pattern_to_string(fingers)}\t{text}\n')
+        print(f'{video}: {transcript.text()!r}')
+
+    print(f'transcribed {len(transcripts)} video(s) in {time.perf_counter() - start:.1f}s')
@@ -0,0 +1,196 @@
+import multiprocessing
+
+import cv2
+import numpy as np
+
+from AirBraille import *
+from WriteHandler import *
+from capture.Preprocess import *
+from hand.Detection import *
+from hand.Detector import *
+from hand.Filter import *
+from hand.Hand import *
+from settings.Settings import *
+from speech.Speech import *
+
+# the pattern of frames without a valid hand pair
+NO_HAND_PAIR: int = -1
+
+
+def _settings() -> dict:
+    """
+    Takes a snapshot of the settings, to be applied in the workers.
+    :return: The settings by name.
+    """
+    return {name: getattr(Settings, name) for name in dir(Settings) if name.isupper()}
+
+
+def _init_worker(settings: dict):
+    """
+    Inits a worker process: applies the settings.
+    :param settings: The settings of the parent process.
+    :return: void.
+    """
+    for name, value in settings.items():
+        setattr(Settings, name, value)
+
+
+def classify_frames(video_path: str, start: int, end: int) -> np.ndarray:
+    """
+    Classifies a range of a video's frames, like AirBraille does for camera frames.
+    Every range has its own hand detection, that tracks the hands from its first frame on, so that the patterns
+    do not depend on the ranges, that a worker classified before.
+    :param video_path: The path of the video.
+    :param start: The index of the first frame.
+    :param end: The index after the last frame.
+    :return: The braille pattern of every frame that could be read, NO_HAND_PAIR if there was no valid hand pair.
+    """
+    patterns = []
+    landmark_filter = OneEuroFilter(Settings.SMOOTHING_MIN_CUTOFF, Settings.SMOOTHING_BETA,
+                                    Settings.SMOOTHING_D_CUTOFF) if Settings.SMOOTHING else None
+    preprocessor = FramePreprocessor(not Settings.MIRROR_LANDMARKS)
+    image = None
+    detector = create_hand_detector(Settings)
+    cap = cv2.VideoCapture(video_path)
+    try:
+        fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+        cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+        for index in range(start, end):
+            # the frame is read into the previous one's array
+            success, image = cap.read(image)
+            if not success:
+                break
+
+            # the camera frames are flipped as well
+            detected_hands = preprocessor.to_selfie_view(detector.detect(preprocessor.process(image)))
+            if landmark_filter is not None:
+                detected_hands = landmark_filter.filter(detected_hands, index / fps)
+
+            hand_pair = HandPair()
+            if hand_pair.is_valid(detected_hands)[0]:
+                hand_pair.define_hands(detected_hands)
+                patterns.append(hand_pair.evaluate())
+            else:
+                patterns.append(NO_HAND_PAIR)
+    finally:
+        cap.release()
+        detector.close()
+
+    return np.array(patterns, dtype=np.int16)
+
+
+def _classify_range(task: tuple) -> np.ndarray:
+    """
+    Unpacks a task for the process pool.
+    :param task: The video path, start and end.
+    :return: See classify_frames.
+    """
+    return classify_frames(*task)
+
+
+class TranscriptWriteHandler(AbstractWriteHandler):
+    """Passes the writing on to another WriteHandler, and logs every written character with its time."""
+
+    def __init__(self, write_handler: AbstractWriteHandler):
+        """
+        Inits the transcript.
+        :param write_handler: The write handler that produces the text.
+        """
+        self.write_handler = write_handler
+        self.timestamp = 0.0  # the video time of the current frame, set by the transcriber
+        self.log = []  # tuples of the video time, the braille pattern and the text
+
+    def write(self, fingers: int) -> str:
+        """
+        Writes the pattern using the write handler, logs the text.
+        :param fingers: The input braille pattern.
+        :return: The text that is provided as audio-feedback.
+        """
+        text = self.write_handler.write(fingers)
+        self.log.append((self.timestamp, fingers, text))
+        return text
+
+    def flush(self) -> str:
+        """
+        Writes the pending patterns using the write handler, logs the text.
+        :return: The text of the pending patterns.
+        """
+        text = self.write_handler.flush()
+        if text:
+            self.log.append((self.timestamp, EMPTY_PATTERN, text))
+        return text
+
+    def is_pending(self) -> bool:
+        return self.write_handler.is_pending()
+
+    def texts(self) -> set:
+        return self.write_handler.texts()
+
+    def text(self) -> str:
+        """
+        The transcribed text.
+        :return: The text of all written characters.
+        """
+        return ''.join(text for _, _, text in self.log)
+
+
+class Transcriber(object):
+    """
+    Transcribes recorded videos of typing sessions. The frames are split into ranges, that are classified
+    in a process pool, and then passed through AirBraille's voting and the write handler in order.
+    """
+
+    def __init__(self, workers: int = None, chunk_size: int = 600):
+        """
+        Inits the transcriber.
+        :param workers: the number of worker processes, the number of cores if None
+        :param chunk_size: the number of frames classified by one task
+        """
+        self.workers = workers or multiprocessing.cpu_count()
+        self.chunk_size = chunk_size
+
+    def classify(self, video_path: str, pool) -> np.ndarray:
+        """
+        Classifies all frames of a video.
+        :param video_path: The path of the video.
+        :param pool: The process pool.
+        :return: The braille pattern of every frame, in order.
+        """
+        cap = cv2.VideoCapture(video_path)
+        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        cap.release()
+
+        # the frame count is only an estimate for some containers, the last range reads until the end
+        tasks = [(video_path, start, start + self.chunk_size) for start in range(0, max(frame_count, 1), self.chunk_size)]
+        last_path, last_start, _ = tasks[-1]
+        tasks[-1] = (last_path, last_start, 1 << 31)
+
+        chunks = list(pool.imap(_classify_range, tasks))
+        return np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.int16)
+
+    def transcribe(self, video_paths: list, write_handler_factory) -> dict:
+        """
+        Transcribes the videos.
+        :param video_paths: The paths of the videos.
+        :param write_handler_factory: Creates a new write handler for every video.
+        :return: The TranscriptWriteHandler of every video, by path.
+        """
+        transcripts = dict()
+        with multiprocessing.Pool(self.workers, _init_worker, (_settings(),)) as pool:
+            for video_path in video_paths:
+                patterns = self.classify(video_path, pool)
+
+                cap = cv2.VideoCapture(video_path)
+                fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+                cap.release()
+
+                transcript = TranscriptWriteHandler(write_handler_factory())
+                air_braille = AirBraille(transcript, speech=SilentSpeech())
+                for index, pattern in enumerate(patterns):
+                    transcript.timestamp = index / fps
+                    air_braille.process_pattern(None if pattern == NO_HAND_PAIR else int(pattern))
+                transcript.flush()
+
+                transcripts[video_path] = transcript
+
+        return transcripts
@@ -0,0 +1,183 @@
+import json
+
+from helpers.Pattern import *
+from table.BrailleTable import *
+
+
+class _Node(object):
+    """A node of the contraction trie, i.e. a sequence of cells, that starts at least one rule."""
+
+    def __init__(self, cells: tuple, mode: str = None):
+        """
+        Inits a node.
+        :param cells: the cells from the root to the node
+        :param mode: the mode, whose trie the node belongs to, None for the rules without mode
+        """
+        self.cells = cells
+        self.mode = mode
+        self.children = dict()  # the next node by cell
+        self.text = None  # the text of the rule, that ends here, None if no rule does
+        self.enters = None  # the mode, the rule that ends here switches to, None if it does not
+        self.transitions = dict()  # memoized transitions by cell, see StreamingTranslator.push
+
+
+class ContractionTable(object):
+    """
+    Rules, that translate sequences of cells to text, compiled into a trie over the cells' patterns.
+    The rules are read from braille files, whose "fingers" are the dots of one cell (e.g. "145") or a list
+    of the dots of several cells (e.g. ["46", "1"] for a capital sign followed by an a).
+    A rule with "enters" switches to a mode, e.g. the number sign followed by a digit to "number". While in
+    a mode, only the rules with that "mode" apply (e.g. a-j as digits); the first cell, that starts none of
+    them (e.g. a space or a letter), leaves the mode and is translated by the rules without mode.
+    """
+
+    def __init__(self, file_paths: list, dots: int):
+        """
+        Inits the table, compiles the rules of the files.
+        :param file_paths: the paths to the braille files, rules of later files must not repeat earlier ones
+        :param dots: the dots that are looked up, e.g. DOTS_6, other points of a cell are ignored
+        """
+        self.dots = dots
+        self.root = _Node(())
+        self.roots = {None: self.root}  # the trie of each mode
+        self.rules = 0
+        self.lookahead = 0  # the most cells of a rule, i.e. the most cells that are ever buffered
+        for file_path in file_paths:
+            self._compile(file_path)
+
+    def _compile(self, file_path: str):
+        """
+        Adds the rules of a braille file to the trie, validates them.
+        :param file_path: The path to the braille file.
+        :return: void.
+        """
+        with open(file_path, 'rb') as rules_file:
+            entries = json.loads(rules_file.read())
+
+        for number, entry in enumerate(entries):
+            where = f'{file_path}: entry {number}'
+            fingers = entry.get('fingers')
+            text = entry.get('c')
+            mode = entry.get('mode')
+            enters = entry.get('enters')
+            if isinstance(fingers, str):
+                fingers = [fingers]
+            if not isinstance(fingers, list) or not fingers or not all(isinstance(cell, str) for cell in fingers) \
+                    or not isinstance(text, str):
+                raise ValueError(f'{where} needs "fingers" (a string or a list of strings) and the string "c"')
+            if not isinstance(mode, (str, type(None))) or not isinstance(enters, (str, type(None))):
+                raise ValueError(f'{where} needs "mode" and "enters" to be strings, if given')
+
+            if mode not in self.roots:
+                self.roots[mode] = _Node((), mode)
+            node = self.roots[mode]
+            for cell in fingers:
+                pattern = parse_cell(cell, where)
+                if pattern & ~self.dots:
+                    break  # the rule can never be typed with these dots
+                if pattern not in node.children:
+                    node.children[pattern] = _Node(node.cells + (pattern,), mode)
+                node = node.children[pattern]
+            else:
+                if node.text is not None:
+                    raise ValueError(f'{where} repeats the rule {fingers}')
+                node.text = text
+                # rules of a mode stay in it, unless they enter another one
+                node.enters = enters if enters is not None else mode
+                self.rules += 1
+                self.lookahead = max(self.lookahead, len(fingers))
+
+    def texts(self) -> set:
+        """
+        The texts of all rules.
+        :return: The texts.
+        """
+        texts = set()
+        nodes = list(self.roots.values())
+        while nodes:
+            node = nodes.pop()
+            if node.text:
+                texts.add(node.text)
+            nodes.extend(node.children.values())
+        return texts
+
+    def resolve(self, cells: tuple, mode: str = None, final: bool = False):
+        """
+        Translates cells, always using the longest rule of the current mode, that starts at the first
+        untranslated cell. A cell, that starts no rule, leaves the mode, or is skipped without mode.
+        Translation stops, as soon as the remaining cells might still be the beginning of a longer rule.
+        :param cells: The cells.
+        :param mode: The mode, the first cell is translated in.
+        :param final: No further cells follow, so all cells are translated.
+        :return: Tuple[the text, the node of the remaining cells (the root of the mode if none remain)].
+        """
+        texts = []
+        start = 0
+        while start < len(cells):
+            node = self.roots[mode]
+            end = start
+            longest = None  # the end and the node of the longest rule
+            while end < len(cells) and cells[end] in node.children:
+                node = node.children[cells[end]]
+                end += 1
+                if node.text is not None:
+                    longest = (end, node)
+            if end == len(cells) and node.children and not final:
+                return ''.join(texts), node
+            if longest is None:
+                if mode is not None:
+                    mode = None  # the cell is translated again, without mode
+                else:
+                    start += 1
+                continue
+            start, rule = longest
+            texts.append(rule.text)
+            mode = rule.enters
+        return ''.join(texts), self.roots[mode]
+
+
+class StreamingTranslator(object):
+    """
+    Translates cells one by one. A cell is buffered, as long as it might be the beginning of a longer rule,
+    and translated, as soon as the translation is unambiguous. The buffered cells are never scanned again:
+    the buffer is a node of the trie (of the current mode), and the translation of (node, cell) is computed once and memoized
+    in the node, so a cell costs a dictionary lookup (amortized O(1)), no matter how many rules exist.
+    """
+
+    def __init__(self, table: ContractionTable):
+        """
+        Inits the translator.
+        :param table: the compiled rules
+        """
+        self.table = table
+        self.node = table.root  # the buffered cells
+
+    def push(self, cell: int) -> str:
+        """
+        Translates the next cell.
+        :param cell: The cell's pattern.
+        :return: The text, that became unambiguous, '' if none.
+        """
+        cell &= self.table.dots
+        transition = self.node.transitions.get(cell)
+        if transition is None:
+            transition = self.table.resolve(self.node.cells + (cell,), self.node.mode)
+            self.node.transitions[cell] = transition
+        text, self.node = transition
+        return text
+
+    def flush(self) -> str:
+        """
+        Translates the buffered cells, as if no further cell followed, e.g. at the end of the input.
+        :return: The text of the buffered cells.
+        """
+        text, _ = self.table.resolve(self.node.cells, self.node.mode, final=True)
+        self.node = self.table.root
+        return text
+
+    def is_pending(self) -> bool:
+        """
+        Determines whether cells are buffered.
+        :return: True, if cells wait for the following ones, False otherwise.
+        """
+        return len(self.node.cells) > 0
@@ -0,0 +1,226 @@
+from collections import deque
+
+from helpers.Pattern import *
+
+
+class SlidingWindowVoter(object):
+    """
+    Streaming majority vote over the latest patterns. The counts are kept incrementally, and
+    patterns are grouped by their count, so that the leader is known after every frame in O(1).
+    Ties go to the pattern, that occurs first in the window, like statistics.mode did. Only then, the window is
+    scanned: when a tie arises, or the leader drops out of the window.
+    """
+
+    def __init__(self, window: int, margin: int = 0):
+        """
+        Inits the voter.
+        :param window: the number of latest patterns, that are voted on
+        :param margin: the number of votes, by which the leader has to outnumber the runner-up,
+                       before it is settled (0: the plurality of the window decides)
+        """
+        self.window = window
+        self.margin = margin
+        self.clear()
+
+    def clear(self):
+        """
+        Forgets all patterns.
+        :return: void.
+        """
+        self._patterns = deque()
+        self._counts = dict()  # pattern -> number of votes
+        self._by_count = dict()  # number of votes -> set of patterns
+        self._max_count = 0
+        self.leader = EMPTY_PATTERN
+
+    def push(self, pattern: int):
+        """
+        Adds the pattern of the latest frame, drops the oldest pattern if the window is full.
+        :param pattern: The braille pattern of the frame.
+        :return: void.
+        """
+        self._patterns.append(pattern)
+        count = self._move(pattern, 1)
+        if count > self._max_count:
+            self._max_count = count
+            self.leader = pattern
+        elif count == self._max_count and pattern != self.leader:
+            self.leader = self._first_leader()
+
+        if len(self._patterns) > self.window:
+            # a tied pattern occurs after the oldest one, so only the leader can lose its lead
+            oldest = self._patterns.popleft()
+            count = self._move(oldest, -1)
+            if not self._by_count.get(self._max_count):
+                self._max_count = count
+            if oldest == self.leader:
+                self.leader = self._first_leader()
+
+    def _first_leader(self) -> int:
+        """
+        Finds the pattern with the most votes, that occurs first in the window.
+        :return: The braille pattern.
+        """
+        for pattern in self._patterns:
+            if self._counts[pattern] == self._max_count:
+                return pattern
+        return EMPTY_PATTERN
+
+    def _move(self, pattern: int, change: int) -> int:
+        """
+        Changes the votes of a pattern by one.
+        :param pattern: The braille pattern.
+        :param change: 1 or -1.
+        :return: The new number of votes of the pattern.
+        """
+        old_count = self._counts.get(pattern, 0)
+        count = old_count + change
+        if old_count > 0:
+            self._by_count[old_count].discard(pattern)
+        if count > 0:
+            self._counts[pattern] = count
+            self._by_count.setdefault(count, set()).add(pattern)
+        else:
+            del self._counts[pattern]
+        return count
+
+    @property
+    def votes(self) -> int:
+        """
+        The votes of the leader.
+        :return: The number of the leader's votes.
+        """
+        return self._max_count
+
+    def is_full(self) -> bool:
+        """
+        Tells, whether enough patterns were collected to vote on.
+        :return: True, if the window is filled.
+        """
+        return len(self._patterns) >= self.window
+
+    def has_margin(self) -> bool:
+        """
+        Tells, whether the leader outnumbers the runner-up by the margin.
+        :return: True, if the leader is settled.
+        """
+        if self.margin <= 0:
+            return True
+        return self._max_count - self._runner_up_votes() >= self.margin
+
+    def _runner_up_votes(self) -> int:
+        """
+        The votes of the runner-up, found by the groups of patterns by count (at most window steps).
+        :return: The number of the runner-up's votes, 0 if there is none.
+        """
+        if len(self._by_count.get(self._max_count, ())) > 1:
+            return self._max_count
+        for count in range(self._max_count - 1, 0, -1):
+            if self._by_count.get(count):
+                return count
+        return 0
+
+
+class SequentialVoter(object):
+    """
+    Sequential vote on the patterns of one take (input confirmation). Every frame votes with a weight, that tells
+    how confident its pattern is. The take is decided as soon as the leader's weight exceeds the runner-up's by
+    the confidence, i.e. once further frames are unlikely to change the leader (a sequential probability ratio
+    test between both, whose log-likelihood ratio grows with every weighted vote), but not before min_frames.
+    Ambiguous poses are decided after max_frames, like without early decisions. Until the pose is released, repeats
+    of the committed pattern are never decided early, and a held pose is typed at the pace of takes of max_frames.
+    """
+
+    def __init__(self, max_frames: int, min_frames: int = 3, confidence: float = 3.0):
+        """
+        Inits the voter.
+        :param max_frames: the number of frames, after which the take is decided in any case
+        :param min_frames: the number of frames, before which the take is never decided
+        :param confidence: the weight, by which the leader has to lead
+        """
+        self.max_frames = max_frames
+        self.min_frames = min_frames
+        self.confidence = confidence
+        self.committed = None  # the pattern of the latest decided take, None once released
+        self._saved_frames = 0  # frames, by which the committed take was decided before max_frames
+        self.clear()
+
+    def commit(self, pattern: int):
+        """
+        Remembers the pattern, that the current take was decided for, so that it is not decided early again.
+        Call it before clear().
+        :param pattern: The braille pattern, that was typed.
+        :return: void.
+        """
+        self.committed = pattern
+        self._saved_frames = max(0, self.max_frames - self.frames)
+
+    def release(self):
+        """
+        Forgets the committed pattern, e.g. as the pose was released, so that it may be decided early again.
+        :return: void.
+        """
+        self.committed = None
+        self._saved_frames = 0
+
+    def clear(self):
+        """
+        Starts a new take.
+        :return: void.
+        """
+        self._weights = dict()  # pattern -> sum of the weights of its votes
+        self._counts = dict()  # pattern -> number of votes
+        self.frames = 0
+        self.leader = EMPTY_PATTERN
+        self.runner_up = None
+
+    def push(self, pattern: int, weight: float = 1.0):
+        """
+        Adds the vote of the latest frame.
+        :param pattern: The braille pattern of the frame.
+        :param weight: The confidence of the frame's pattern, between 0 and 1.
+        :return: void.
+        """
+        self.frames += 1
+        self._counts[pattern] = self._counts.get(pattern, 0) + 1
+        self._weights[pattern] = self._weights.get(pattern, 0.0) + weight
+        # weights only grow within a take, so the leader and the runner-up are kept up to date in O(1)
+        if self.frames == 1:
+            self.leader = pattern
+        elif pattern != self.leader:
+            if self._key(pattern) > self._key(self.leader):
+                self.runner_up = self.leader
+                self.leader = pattern
+            elif self.runner_up is None or self._key(pattern) > self._key(self.runner_up):
+                self.runner_up = pattern
+
+    def _key(self, pattern: int) -> tuple:
+        return self._weights[pattern], self._counts[pattern]
+
+    @property
+    def votes(self) -> int:
+        """
+        The votes of the leader.
+        :return: The number of the leader's votes.
+        """
+        return self._counts.get(self.leader, 0)
+
+    def lead(self) -> float:
+        """
+        The weight, by which the leader leads.
+        :return: The leader's weight minus the runner-up's weight.
+        """
+        runner_up = self._weights[self.runner_up] if self.runner_up is not None else 0.0
+        return self._weights.get(self.leader, 0.0) - runner_up
+
+    def is_decided(self) -> bool:
+        """
+        Tells, whether the take is decided.
+        :return: True, if the leader is settled or max_frames were voted on.
+        """
+        if self.leader == self.committed:
+            # the frames saved by deciding the committed take early are made up for
+            return self.frames >= self.max_frames + self._saved_frames
+        if self.frames >= self.max_frames:
+            return True
+        return self.frames >= self.min_frames and self.lead() >= self.confidence